@@ -1,10 +1,33 @@
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
 from app import create_app
-import json
+import asyncio
+import base64
 
 app = create_app()
 
+# Reused across warm invocations so the loop and the connections bound to it
+# are not rebuilt on every request. This is a uvloop loop when uvloop is
+# installed, since importing app sets the event loop policy.
+_LOOP = asyncio.new_event_loop()
+asyncio.set_event_loop(_LOOP)
+
+# Pre-encoded names of the headers seen on almost every request
+_HEADER_NAMES = {
+    name: name.encode('latin-1')
+    for name in (
+        'host', 'user-agent', 'accept', 'accept-encoding', 'accept-language',
+        'connection', 'content-type', 'content-length', 'cookie', 'origin', 'referer'
+    )
+}
+
+def _encode_headers(headers):
+    """Convert a header dict to the ASGI list of (name, value) byte pairs"""
+    encoded = []
+    for key, value in headers.items():
+        name = key.lower()
+        encoded.append((_HEADER_NAMES.get(name) or name.encode('latin-1'), value.encode('latin-1')))
+    return encoded
+
 def handler(event, context):
     """Handle serverless function requests"""
     # Convert Vercel event to ASGI scope
@@ -22,7 +45,7 @@ def handler(event, context):
         'server': ('vercel', 443),
         'path': path,
         'query_string': query_string.encode() if query_string else b'',
-        'headers': [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        'headers': _encode_headers(headers),
         'raw_path': path.encode(),
     }
     
@@ -30,19 +53,24 @@ def handler(event, context):
     async def receive():
         return {'type': 'http.request', 'body': body.encode() if body else b''}
     
+    # Streaming responses send their body in several messages
+    body_parts = []
+    
     async def send(message):
         if message['type'] == 'http.response.start':
             context.statusCode = message['status']
             context.headers = dict(message['headers'])
         elif message['type'] == 'http.response.body':
-            context.body = message['body']
+            body_parts.append(message.get('body', b''))
     
     # Run the ASGI application
-    import asyncio
-    asyncio.run(app(scope, receive, send))
+    _LOOP.run_until_complete(app(scope, receive, send))
     
+    # Hand the raw response bytes back base64-encoded instead of decoding them
+    response_body = b''.join(body_parts)
     return {
         'statusCode': context.statusCode,
         'headers': context.headers,
-        'body': context.body.decode() if isinstance(context.body, bytes) else context.body
+        'body': base64.b64encode(response_body).decode('ascii'),
+        'isBase64Encoded': True
     } 
\ No newline at end of file
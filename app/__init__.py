@@ -1,38 +1,70 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from starlette.formparsers import MultiPartParser
 import os
 import logging
 import sys
 
-from app.routes.collection_routes import router as collection_router
-from app.routes.health_routes import router as health_router
-from app.providers.collection_service import CollectionService
-from app.repositories.collection_repository import CollectionRepository
-from app.providers.message_broker import DataCollectorMessageBroker
-from app.config import settings
+from app.config import get_settings
 
-# Configure logging
-logging.basicConfig(
-    level=settings.LOG_LEVEL,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('data_collector.log')
-    ]
-)
+# Prefer the libuv-based event loop when it is installed (it is not available
+# on Windows). Uvicorn picks it up on its own; this also covers api/index.py.
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+else:
+    uvloop.install()
 
 logger = logging.getLogger(__name__)
 
 def create_app():
     """Create and configure FastAPI application"""
+    settings = get_settings()
+    
+    # Configure logging before the imports below, which may log. The log file
+    # is opt-in because serverless deployments (see api/index.py) run on a
+    # read-only filesystem.
+    log_handlers = [logging.StreamHandler(sys.stdout)]
+    if os.getenv("ENABLE_FILE_LOG"):
+        log_handlers.append(logging.FileHandler('data_collector.log'))
+    
+    logging.basicConfig(
+        level=settings.LOG_LEVEL,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=log_handlers
+    )
+    
+    # Uploads stay in memory up to this size and only larger ones are
+    # spooled to disk (Starlette's default is 1MB). Starlette only offers
+    # this as a class attribute, so it applies to the whole process; this
+    # service runs one app per process, and the tests restore it.
+    MultiPartParser.max_file_size = settings.UPLOAD_SPOOL_SIZE
+    
+    # Imported here so that importing the package does not pull in the
+    # routers, processors and database drivers until an app is built
+    from app.routes.collection_routes import router as collection_router
+    from app.routes.health_routes import router as health_router
+    from app.providers.collection_service import CollectionService
+    from app.repositories.collection_repository import CollectionRepository
+    from app.providers.url.base_url_processor import BaseURLProcessor
+    from app.utils.middleware import LimitUploadSizeMiddleware
+    
     # Create FastAPI application
     app = FastAPI(
         title="Data Collector API",
         description="API for collecting data from various sources",
-        version="1.0.0"
+        version="1.0.0",
+        default_response_class=ORJSONResponse
     )
     
+    # Turn away oversized uploads from their Content-Length, before the
+    # multipart parser spools them. Added before CORS so that the 413
+    # still carries the CORS headers browsers need to read it.
+    app.add_middleware(LimitUploadSizeMiddleware, max_size=settings.MAX_UPLOAD_BYTES)
+    
     # Add CORS middleware
     app.add_middleware(
         CORSMiddleware,
@@ -42,9 +74,15 @@ def create_app():
         allow_headers=["*"],
     )
     
-    # Initialize repository and service
+    # Compress JSON responses (collection lists, related articles); small
+    # bodies are not worth the CPU
+    app.add_middleware(GZipMiddleware, minimum_size=1024)
+    
+    # Initialize repository and service, shared by all requests
     repository = CollectionRepository()
     collection_service = CollectionService(repository=repository)
+    app.state.repository = repository
+    app.state.collection_service = collection_service
     
     # Include routers
     app.include_router(collection_router, tags=["collections"])
@@ -54,7 +92,7 @@ def create_app():
     @app.exception_handler(Exception)
     async def generic_exception_handler(request: Request, exc: Exception):
         """Handle any unhandled exceptions"""
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": "Internal server error", "detail": str(exc)}
         )
@@ -73,6 +111,7 @@ def create_app():
         """Initialize services on startup"""
         try:
             await collection_service.connect()
+            await repository.ensure_indexes()
             logger.info("Services initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize services: {str(e)}")
@@ -83,6 +122,7 @@ def create_app():
         """Cleanup on shutdown"""
         try:
             await collection_service.close()
+            await BaseURLProcessor.aclose()
             logger.info("Services cleaned up successfully")
         except Exception as e:
             logger.error(f"Error during cleanup: {str(e)}")
@@ -1,10 +1,18 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any
-from datetime import datetime
+from app.utils.helpers import utc_timestamp
 
 
 class BaseCleaner(ABC):
-    """Base class for all data cleaners"""
+    """Base class for all data cleaners
+    
+    Instances are cached and shared by CleanerFactory, so cleaners must not
+    keep per-document state on self.
+    """
+    
+    # Skip clean_specific when there is no content to clean. Cleaners whose
+    # clean_specific also fills in metadata should turn this off.
+    skip_empty_content = True
     
     def clean(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Clean the collected data before storage
@@ -17,13 +25,15 @@ class BaseCleaner(ABC):
         """
         # Common cleaning tasks for all data types
         
-        # Run the specific cleaning tasks for this data type
-        data = self.clean_specific(data)
+        # Run the specific cleaning tasks for this data type, unless there
+        # is nothing to clean
+        if data.get("content") or not self.skip_empty_content:
+            data = self.clean_specific(data)
         
         # Add cleaning metadata
-        data["metadata"] = data.get("metadata", {})
-        data["metadata"]["cleaned"] = True
-        data["metadata"]["cleaned_at"] = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+        metadata = data.setdefault("metadata", {})
+        metadata["cleaned"] = True
+        metadata["cleaned_at"] = utc_timestamp()
         
         return data
     
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Dict, Any, Optional
 from app.cleaners.wiki_cleaner import WikipediaCleaner
 from app.cleaners.pubmed_cleaner import PubMedCleaner
@@ -11,6 +12,9 @@ class CleanerFactory:
     def get_cleaner(source_type: str, file_type: Optional[str] = None) -> BaseCleaner:
         """Get the appropriate cleaner based on source type
         
+        Cleaners hold no per-document state, so instances are cached and
+        shared between calls.
+        
         Args:
             source_type: The type of data source (wikipedia, pubmed)
             file_type: Not used, kept for backward compatibility
@@ -18,15 +22,29 @@ class CleanerFactory:
         Returns:
             An appropriate cleaner instance
         """
-        # Web source cleaners
-        if source_type.lower() == "wikipedia":
-            return WikipediaCleaner()
-        elif source_type.lower() == "pubmed":
-            return PubMedCleaner()
-        elif source_type.lower() == "file_upload":
-            if not file_type:
-                raise ValueError("File type is required for file uploads")
-            return FileCleaner(file_type)
-        
-        # Default case
-        raise ValueError(f"Unsupported source type: {source_type}")
\ No newline at end of file
+        source_type = source_type.lower()
+        if source_type != "file_upload":
+            file_type = None
+        elif file_type:
+            file_type = file_type.lower()
+        return _create_cleaner(source_type, file_type)
+
+
+# Web source cleaners, keyed by normalized source type
+_WEB_CLEANERS = {
+    "wikipedia": WikipediaCleaner,
+    "pubmed": PubMedCleaner
+}
+
+@lru_cache(maxsize=32)
+def _create_cleaner(source_type: str, file_type: Optional[str]) -> BaseCleaner:
+    """Create a cleaner for a normalized source type"""
+    if source_type == "file_upload":
+        if not file_type:
+            raise ValueError("File type is required for file uploads")
+        return FileCleaner(file_type)
+    
+    cleaner_class = _WEB_CLEANERS.get(source_type)
+    if cleaner_class is None:
+        raise ValueError(f"Unsupported source type: {source_type}")
+    return cleaner_class()
\ No newline at end of file
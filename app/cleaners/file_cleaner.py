@@ -4,6 +4,9 @@ from app.cleaners.base_cleaner import BaseCleaner
 class FileCleaner(BaseCleaner):
     """Cleaner for uploaded files"""
     
+    # File metadata is added even when no text could be extracted
+    skip_empty_content = False
+    
     def __init__(self, file_type: str):
         """Initialize with file type
         
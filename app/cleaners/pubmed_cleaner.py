@@ -2,6 +2,20 @@ import re
 from typing import Dict, Any
 from .base_cleaner import BaseCleaner
 
+# Compiled once at import time; each pattern handles all of its alternatives
+# in a single scan of the content
+_SECTION_HEADING = re.compile(
+    r'(BACKGROUND|INTRODUCTION|METHODS|MATERIALS AND METHODS|RESULTS'
+    r'|CONCLUSION|CONCLUSIONS|DISCUSSION):',
+    re.IGNORECASE
+)
+_MEDICAL_ABBREVIATIONS = {
+    'RCT': 'Randomized Controlled Trial',
+    'DOI': 'Digital Object Identifier',
+    'PMID': 'PubMed ID'
+}
+_MEDICAL_ABBREVIATION = re.compile(r'\b(?:RCT|DOI|PMID)\b', re.IGNORECASE)
+
 class PubMedCleaner(BaseCleaner):
     """Specific cleaner for PubMed content"""
     
@@ -20,17 +34,8 @@ class PubMedCleaner(BaseCleaner):
         if "content" in data and isinstance(data["content"], str):
             content = data["content"]
             
-            # Identify and format abstract sections
-            section_patterns = [
-                r'(BACKGROUND|INTRODUCTION):', 
-                r'(METHODS|MATERIALS AND METHODS):', 
-                r'(RESULTS):', 
-                r'(CONCLUSION|CONCLUSIONS|DISCUSSION):'
-            ]
-            
             # Ensure sections are properly formatted
-            for pattern in section_patterns:
-                content = re.sub(pattern, r'\n\n\1:\n', content, flags=re.IGNORECASE)
+            content = _SECTION_HEADING.sub(r'\n\n\1:\n', content)
                 
             data["content"] = content
         return data
@@ -41,15 +46,17 @@ class PubMedCleaner(BaseCleaner):
             content = data["content"]
             
             # Standardize medical abbreviations
-            medical_abbr = {
-                r'\bRCT\b': 'Randomized Controlled Trial',
-                r'\bDOI\b': 'Digital Object Identifier',
-                r'\bPMID\b': 'PubMed ID'
-            }
+            # Only expand the first occurrence of each, leave others as is
+            expanded = set()
+            
+            def expand(match):
+                abbr = match.group(0).upper()
+                if abbr in expanded:
+                    return match.group(0)
+                expanded.add(abbr)
+                return _MEDICAL_ABBREVIATIONS[abbr]
             
-            for abbr, full in medical_abbr.items():
-                # Only expand the first occurrence, leave others as is
-                content = re.sub(abbr, full, content, count=1, flags=re.IGNORECASE)
+            content = _MEDICAL_ABBREVIATION.sub(expand, content)
                 
             data["content"] = content
         return data
\ No newline at end of file
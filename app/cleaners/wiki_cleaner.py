@@ -1,7 +1,35 @@
 import re
+import logging
 from typing import Dict, Any
 from .base_cleaner import BaseCleaner
 
+logger = logging.getLogger(__name__)
+
+# Compiled once at import time instead of on every cleaning call
+_MALFORMED_HEADER = re.compile(r'(=={1,})\s*(.*?)\s*\1[\r\n]+=$')
+# Paragraph breaks (in either line ending style), display math and inline
+# math are kept verbatim
+_PROTECTED = re.compile(r'(\r?\n\r?\n)|\{\\displaystyle[^}]+\}|\$[^\$]+\$')
+_UNWANTED_SECTIONS = re.compile(
+    r"==\s*(?:See also|References|Further reading|External links|Notes)\s*=="
+    r".*?(?===|\Z)",  # Match until next header or end of text
+    re.DOTALL
+)
+_INVISIBLE_CHARS = str.maketrans("", "", "\u2061\u200b\u200c\u200d\u200e\u200f\ufeff")
+_CITATION = re.compile(r'\[\d+\]')
+_PAGE_REFERENCE = re.compile(r"\s*:\s*[\d§,–]+(?:\s*:\s*[\d§,–]+)*")
+_PUNCT_SPACING = re.compile(r'\s+([.,;:!?)])|\(\s+')
+_HEADER = re.compile(r'(==+)\s*(.*?)\s*\1')
+_ASYMMETRIC_HEADER = re.compile(r'(={2,})\s*(.*?)\s*(={1,})')
+_TRAILING_EQUALS_HEADER = re.compile(r'(=={1,})\s*(.*?)\s*\1\s*\n\s*=')
+_HEADER_SPACING = re.compile(r'(={2,}.*?={2,})([^\n])')
+_STANDALONE_EQUALS = re.compile(r'(?<=\n)=(?=\s*\n)')
+_EXTRA_NEWLINES = re.compile(r'\n{3,}')
+_CATEGORY_LINK = re.compile(r'\[\[Category:.*?\]\]')
+_LANGUAGE_LINK = re.compile(r'\[\[[a-z\-]+:[^\]]+\]\]')
+_DISAMBIGUATION = re.compile(r'This article is about.*?For other uses.*?\n', re.DOTALL)
+_INFOBOX = re.compile(r'\{\{Infobox.*?\}\}', re.DOTALL)
+
 class WikipediaCleaner(BaseCleaner):
     """Cleaner specifically for Wikipedia content"""
     
@@ -20,7 +48,7 @@ class WikipediaCleaner(BaseCleaner):
         """
         Cleans Wikipedia content for AI processing by:
         1. Removing unwanted sections (references, links, etc.)
-        2. Preserving mathematical formulas and structural elements
+        2. Preserving mathematical formulas and paragraph breaks
         3. Normalizing spacing and formatting
         4. Ensuring consistent header formatting
         
@@ -33,124 +61,106 @@ class WikipediaCleaner(BaseCleaner):
         # Early return for empty text
         if not text:
             return ""
-        print("Cleaning Wikipedia text...")
+        logger.debug("Cleaning Wikipedia text...")
+        # Header passes are skipped entirely for text without any headers
+        has_headers = '==' in text
+        
         # Pre-clean: Fix malformed headers with trailing equals signs
-        text = re.sub(r'(=={1,})\s*(.*?)\s*\1[\r\n]+=$', r'\1 \2 \1', text)
+        if has_headers:
+            text = _MALFORMED_HEADER.sub(r'\1 \2 \1', text)
+        
+        # STEP 1: Remove unwanted sections in a single pass
+        if has_headers:
+            text = _UNWANTED_SECTIONS.sub("", text)
+        
+        # STEP 2: Walk the text once, emitting paragraph breaks and math
+        # formulas verbatim and cleaning the spans between them. Line endings
+        # are normalized to Unix style along the way; line breaks inside the
+        # cleaned spans are collapsed with the rest of the whitespace.
+        parts = []
+        pos = 0
+        for match in _PROTECTED.finditer(text):
+            parts.append(self._clean_span(text[pos:match.start()]))
+            if match.group(1):
+                parts.append("\n\n")
+            else:
+                parts.append(match.group(0).replace('\r\n', '\n'))
+            pos = match.end()
+        parts.append(self._clean_span(text[pos:]))
+        text = "".join(parts)
+        
+        # STEP 3: Final formatting
+        # Fix spacing around punctuation and parentheses
+        text = _PUNCT_SPACING.sub(lambda m: m.group(1) or '(', text)
         
-        # Normalize line endings to Unix style
-        text = text.replace('\r\n', '\n')
+        # Cleaning can join stray equals signs, so check for headers again
+        if '==' in text:
+            # Normalize section headers
+            text = _HEADER.sub(r'\1 \2 \1', text)
             
-        # STEP 1: Preserve important elements that need special handling
-        preserved = {}
-        preserve_count = 0
-        
-        # Helper function to preserve patterns
-        def preserve(pattern):
-            nonlocal preserve_count, text
+            # Fix asymmetric headers
+            text = _ASYMMETRIC_HEADER.sub(
+                lambda m: f"{m.group(1)} {m.group(2)} {m.group(1)}" 
+                if len(m.group(3)) != len(m.group(1)) else m.group(0), 
+                text)
             
-            def replacer(match):
-                nonlocal preserve_count
-                key = f"||PRESERVED_{preserve_count}||"
-                preserved[key] = match.group(0)
-                preserve_count += 1
-                return key
-                
-            return re.sub(pattern, replacer, text)
-        
-        # Preserve paragraph breaks, section headers and mathematical formulas
-        text = text.replace("\n\n", "||PARA||")
-        text = preserve(r'==(=*)\s*(.*?)\s*\1==')  # Section headers
-        text = preserve(r'\{\\displaystyle[^}]+\}')  # Display math
-        text = preserve(r'\$[^\$]+\$')  # Inline math
-        
-        # STEP 2: Remove unwanted sections - FIXED SECTION
-        # First restore section headers for proper removal
-        section_keys_to_restore = []
-        for key, value in preserved.items():
-            if '==' in value:  # Only restore section headers
-                section_keys_to_restore.append(key)
+            # Fix malformed headers with trailing equals signs (after any preservation done)
+            text = _TRAILING_EQUALS_HEADER.sub(r'\1 \2 \1', text)
+            
+            # Ensure headers have proper spacing
+            text = _HEADER_SPACING.sub(r'\1\n\n\2', text)
         
-        # Restore section headers but keep track of keys to not restore later
-        section_keys_to_remove = []
-        for key in section_keys_to_restore:
-            text = text.replace(key, preserved[key])
-            section_keys_to_remove.append(key)
+        # Clean up any remaining standalone equal signs
+        if '\n=' in text:
+            text = _STANDALONE_EQUALS.sub('', text)
         
-        # Define unwanted sections with more flexible patterns
-        unwanted_sections = [
-            r"==\s*See also\s*==",
-            r"==\s*References\s*==",
-            r"==\s*Further reading\s*==",
-            r"==\s*External links\s*==",
-            r"==\s*Notes\s*=="
-        ]
+        # Normalize multiple newlines (max 2)
+        if '\n\n\n' in text:
+            text = _EXTRA_NEWLINES.sub('\n\n', text)
         
-        # Improved section removal that handles various formatting scenarios
-        for section in unwanted_sections:
-            pattern = rf"({section}).*?(?===|\Z)"  # Match until next header or end of text
-            text = re.sub(pattern, "", text, flags=re.DOTALL)
+        return text.strip()
+    
+    def _clean_span(self, span: str) -> str:
+        """Clean a span of text that lies between protected elements"""
+        if not span:
+            return span
         
-        # STEP 3: Remove citations and reference markers
+        # Remove citations and reference markers
         # (These complement the basic citation removals from WebCleaner)
-        text = re.sub(r'\[\d+\]', '', text)  # [1], [2], etc.
-        text = re.sub(r"\s*:\s*[\d§,–]+(?:\s*:\s*[\d§,–]+)*", "", text)  # : 123, : 45 : 67
-        
-        # STEP 4: Clean whitespace and normalize formatting
-        text = re.sub(r"\s+", " ", text)  # Normalize spaces
+        span = _CITATION.sub('', span)  # [1], [2], etc.
+        span = _PAGE_REFERENCE.sub("", span)  # : 123, : 45 : 67
+        
+        # Normalize spaces, keeping a single space at either edge so the span
+        # stays separated from its neighbouring protected elements
+        words = span.split()
+        if not words:
+            return " " if span else span
+        normalized = " ".join(words)
+        if span[0].isspace():
+            normalized = " " + normalized
+        if span[-1].isspace():
+            normalized += " "
         
         # Remove invisible Unicode characters
-        invisible_chars = ["\u2061", "\u200b", "\u200c", "\u200d", "\u200e", "\u200f", "\ufeff"]
-        for char in invisible_chars:
-            text = text.replace(char, "")
-        
-        # STEP 5: Restore preserved elements
-        text = text.replace("||PARA||", "\n\n")
-        for key, value in preserved.items():
-            if key not in section_keys_to_remove:  # Don't restore section headers we already handled
-                text = text.replace(key, value)
-        
-        # STEP 6: Final formatting
-        # Fix spacing around punctuation and parentheses
-        text = re.sub(r'\s+([.,;:!?])', r'\1', text)
-        text = re.sub(r'\(\s+', '(', text)
-        text = re.sub(r'\s+\)', ')', text)
-        
-        # Normalize section headers
-        text = re.sub(r'(==+)\s*(.*?)\s*\1', r'\1 \2 \1', text)
-        
-        # Fix asymmetric headers
-        text = re.sub(r'(={2,})\s*(.*?)\s*(={1,})', 
-                      lambda m: f"{m.group(1)} {m.group(2)} {m.group(1)}" 
-                      if len(m.group(3)) != len(m.group(1)) else m.group(0), 
-                      text)
-        
-        # Fix malformed headers with trailing equals signs (after any preservation done)
-        text = re.sub(r'(=={1,})\s*(.*?)\s*\1\s*\n\s*=', r'\1 \2 \1', text)
-        
-        # Ensure headers have proper spacing
-        text = re.sub(r'(={2,}.*?={2,})([^\n])', r'\1\n\n\2', text)
-        
-        # Clean up any remaining standalone equal signs
-        text = re.sub(r'(?<=\n)=(?=\s*\n)', '', text)
-        
-        # Normalize multiple newlines (max 2)
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        
-        return text.strip()
+        return normalized.translate(_INVISIBLE_CHARS)
     
     def _remove_wikipedia_specific(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Remove Wikipedia-specific elements like category links, edit links, etc."""
         if "content" in data and isinstance(data["content"], str):
             content = data["content"]
             
-            # Remove category links
-            content = re.sub(r'\[\[Category:.*?\]\]', '', content)
-            
-            # Remove language links
-            content = re.sub(r'\[\[[a-z\-]+:[^\]]+\]\]', '', content)
+            # The substring checks skip a full regex scan when nothing matches
+            if '[[' in content:
+                # Remove category links
+                if '[[Category:' in content:
+                    content = _CATEGORY_LINK.sub('', content)
+                
+                # Remove language links
+                content = _LANGUAGE_LINK.sub('', content)
             
             # Remove disambiguation notices
-            content = re.sub(r'This article is about.*?For other uses.*?\n', '', content, flags=re.DOTALL)
+            if 'This article is about' in content:
+                content = _DISAMBIGUATION.sub('', content)
             
             data["content"] = content
         return data
@@ -161,16 +171,14 @@ class WikipediaCleaner(BaseCleaner):
             content = data["content"]
             
             # Extract infobox data if needed
-            infobox_pattern = r'\{\{Infobox.*?\}\}'
-            infoboxes = re.findall(infobox_pattern, content, re.DOTALL)
+            infoboxes = _INFOBOX.findall(content)
             
             if infoboxes:
                 # Store infobox data in a structured way if needed
-                data["metadata"] = data.get("metadata", {})
-                data["metadata"]["infobox"] = infoboxes[0]  # Store first infobox
+                data.setdefault("metadata", {})["infobox"] = infoboxes[0]  # Store first infobox
                 
                 # Remove infoboxes from main content
-                content = re.sub(infobox_pattern, '', content, flags=re.DOTALL)
+                content = _INFOBOX.sub('', content)
                 data["content"] = content
                 
         return data
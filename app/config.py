@@ -1,10 +1,12 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 import os
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+# Load environment variables from .env file (not shipped to production)
+if os.getenv("ENV") != "production":
+    load_dotenv()
 
 class Settings(BaseSettings):
     # API Settings
@@ -41,21 +43,34 @@ class Settings(BaseSettings):
     
     # File Upload Settings
     MAX_FILE_SIZE: int = 5 * 1024 * 1024  # 5MB
+    UPLOAD_SPOOL_SIZE: int = 8 * 1024 * 1024  # 8MB, uploads below this stay in memory
     MAX_CONTENT_LENGTH: int = 1 * 1024 * 1024  # 1MB
     ALLOWED_EXTENSIONS: set = {'.pdf', '.doc', '.docx'}
     SUPPORTED_FILE_TYPES: list = ["pdf", "docx", "txt"]
     
+    # HTTP Cache Settings
+    HTTP_CACHE_DIR: Optional[str] = None  # responses are cached in memory when unset
+    HTTP_CACHE_TTL: int = 24 * 60 * 60  # 24h, upper bound on what the headers allow
+    
+    # Collection Read Cache Settings
+    COLLECTION_CACHE_TTL: float = 5.0  # seconds; bounds staleness across workers, 0 disables
+    
     # Service Settings
     SERVICE_NAME: str = "wikipedia-collector-service"
     
+    @property
+    def MAX_UPLOAD_BYTES(self) -> int:
+        """Largest accepted request body: a MAX_FILE_SIZE file plus form fields"""
+        return self.MAX_FILE_SIZE + 64 * 1024
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
 
 @lru_cache()
 def get_settings() -> Settings:
-    """Get cached settings instance"""
+    """Get cached settings instance
+    
+    Settings are built on first use rather than at import time.
+    """
     return Settings()
-
-# Create settings instance
-settings = get_settings()
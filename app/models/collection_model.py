@@ -4,18 +4,6 @@ from pydantic import BaseModel, Field, ConfigDict
 
 class CollectionCreate(BaseModel):
     """Schema for creating a collection"""
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "title": "DNA Structure",
-                "content": "DNA is a double helix...",
-                "url": "https://en.wikipedia.org/wiki/DNA",
-                "scientific_topics": ["biology", "genetics"],
-                "metadata": {"source": "wikipedia"}
-            }
-        }
-    )
-    
     title: str
     content: str
     url: Optional[str] = None
@@ -24,20 +12,8 @@ class CollectionCreate(BaseModel):
 
 class CollectionResponse(BaseModel):
     """Schema for collection response"""
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "id": "60a3c3d6c2d93e3e1c6e9b2a",
-                "title": "DNA Structure",
-                "content": "DNA is a double helix...",
-                "url": "https://en.wikipedia.org/wiki/DNA",
-                "scientific_topics": ["biology", "genetics"],
-                "metadata": {"source": "wikipedia"},
-                "created_at": "2025-05-04T07:56:31",
-                "updated_at": "2025-05-04T07:56:31"
-            }
-        }
-    )
+    # Read-only DTO; never mutated after construction
+    model_config = ConfigDict(frozen=True)
     
     id: str
     title: str
@@ -48,23 +24,12 @@ class CollectionResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
+class CollectionListResponse(BaseModel):
+    """Schema for the collection list response"""
+    collections: List[CollectionResponse]
+
 class Collection(BaseModel):
     """Model for a collection of data"""
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "title": "Quantum Computing Basics",
-                "content": "Quantum computing is a type of computing...",
-                "url": "https://example.com/quantum-computing",
-                "scientific_topics": ["quantum computing", "physics"],
-                "metadata": {
-                    "source": "wikipedia",
-                    "language": "en"
-                }
-            }
-        }
-    )
-    
     id: Optional[str] = None
     title: str
     content: str
@@ -75,8 +40,12 @@ class Collection(BaseModel):
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
     def to_response(self) -> CollectionResponse:
-        """Convert to Pydantic response model"""
-        return CollectionResponse(
+        """Convert to Pydantic response model
+        
+        The collection's fields are already validated, so validation is
+        skipped when building the response.
+        """
+        return CollectionResponse.model_construct(
             id=self.id or "",
             title=self.title,
             content=self.content,
@@ -1,57 +1,101 @@
-from typing import Dict, Any, Optional, List, BinaryIO
+from typing import Dict, Any, Optional, List, AsyncIterator, BinaryIO, Iterator, Mapping, Tuple
 import os
 import re
+import importlib
 import asyncio
 import logging
+import time
+from collections import OrderedDict
+from bson import ObjectId
 from fastapi import UploadFile
 
+from app.config import get_settings
 from app.models.collection_model import Collection
 from app.repositories.collection_repository import CollectionRepository
-from app.providers.url.wikipedia_processor import WikipediaProcessor
-from app.providers.url.pubmed_processor import PubMedProcessor
-from app.providers.file.pdf_processor import PDFProcessor
-from app.providers.file.docx_processor import DOCXProcessor
-from app.providers.file.txt_processor import TXTProcessor
+from app.providers.base_content_processor import BaseContentProcessor
 from app.providers.script_processor import ScriptProcessor
-from app.utils.helpers import is_wikipedia_url, get_file_extension
+from app.utils.helpers import is_wikipedia_url, get_file_extension, utc_timestamp
 from app.cleaners.cleaner_factory import CleanerFactory
-from datetime import datetime
 from app.providers.message_broker import DataCollectorMessageBroker
 
 logger = logging.getLogger(__name__)
 
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload is larger than the configured MAX_FILE_SIZE"""
+
+_PUBMED_URL = re.compile(r'https?://(?:www\.)?pubmed\.ncbi\.nlm\.nih\.gov/\d', re.ASCII)
+
+# Size of the chunks uploads are read in
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+# Canonical URL prefixes routed without a regex; the processor's own
+# validate_url still checks the rest of the URL
+_URL_ROUTES = (
+    ("https://en.wikipedia.org/wiki/", 'wikipedia'),
+    ("https://pubmed.ncbi.nlm.nih.gov/", 'pubmed')
+)
+
+class _LazyProcessors(Mapping):
+    """Read-only mapping of processors that are imported and built on first use
+    
+    Keeps heavy parser dependencies (python-docx, PyMuPDF, BeautifulSoup) off
+    the import path until a source that needs them is processed.
+    """
+    
+    def __init__(self, paths: Dict[str, str]):
+        self._paths = paths  # key -> "module:ClassName"
+        self._instances: Dict[str, BaseContentProcessor] = {}
+    
+    def __getitem__(self, key: str) -> BaseContentProcessor:
+        processor = self._instances.get(key)
+        if processor is None:
+            module_name, class_name = self._paths[key].split(":")
+            processor = getattr(importlib.import_module(module_name), class_name)()
+            self._instances[key] = processor
+        return processor
+    
+    def __contains__(self, key: object) -> bool:
+        return key in self._paths
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
+    
+    def __len__(self) -> int:
+        return len(self._paths)
+
+# Processors hold no per-request state, so one instance of each is shared by
+# every CollectionService in the process
+_URL_PROCESSORS = _LazyProcessors({
+    'wikipedia': 'app.providers.url.wikipedia_processor:WikipediaProcessor',
+    'pubmed': 'app.providers.url.pubmed_processor:PubMedProcessor'
+})
+_FILE_PROCESSORS = _LazyProcessors({
+    '.pdf': 'app.providers.file.pdf_processor:PDFProcessor',
+    '.docx': 'app.providers.file.docx_processor:DOCXProcessor',
+    '.txt': 'app.providers.file.txt_processor:TXTProcessor'
+})
+_SCRIPT_PROCESSOR = ScriptProcessor()
+
 class CollectionService:
     """Service for collecting data from various sources (Wikipedia, files, etc.)"""
     
+    # Most collections kept in the read cache
+    COLLECTION_CACHE_SIZE = 1024
+    
     def __init__(self, repository: CollectionRepository):
         """Initialize the service with its dependencies"""
         self.repository = repository
         self.message_broker = DataCollectorMessageBroker()
         self._connected = False
+        self._collection_cache: "OrderedDict[str, Tuple[float, Collection]]" = OrderedDict()
+        self._collection_loads: Dict[str, asyncio.Future] = {}
+        self.collection_cache_ttl = get_settings().COLLECTION_CACHE_TTL
         
-        # Initialize URL processors
-        self.url_processors = {
-            'wikipedia': WikipediaProcessor(),
-            'pubmed': PubMedProcessor()
-        }
-        
-        # Initialize file processors
-        self.file_processors = {
-            '.pdf': PDFProcessor(),
-            '.docx': DOCXProcessor(),
-            '.txt': TXTProcessor()
-        }
-        
-        # Initialize script processor
-        self.script_processor = ScriptProcessor()
-        
-        self.pdf_processor = PDFProcessor()
-        self.txt_processor = TXTProcessor()
-        self.docx_processor = DOCXProcessor()
-        self.url_processor = {
-            'wikipedia': WikipediaProcessor(),
-            'pubmed': PubMedProcessor()
-        }
+        # Shared URL, file and script processors
+        self.url_processors = _URL_PROCESSORS
+        self.file_processors = _FILE_PROCESSORS
+        self.script_processor = _SCRIPT_PROCESSOR
     
     async def __aenter__(self):
         """Support async with statement"""
@@ -73,15 +117,71 @@ class CollectionService:
     
     def _get_url_processor(self, url: str):
         """Get appropriate processor for URL"""
+        for prefix, key in _URL_ROUTES:
+            if url.startswith(prefix):
+                return self.url_processors[key]
+        
+        # Other languages, http:// and www. variants
         if is_wikipedia_url(url):
             return self.url_processors['wikipedia']
         
-        if re.match(r'^https?://(www\.)?pubmed\.ncbi\.nlm\.nih\.gov/\d+', url):
+        if _PUBMED_URL.match(url):
             return self.url_processors['pubmed']
         
         raise ValueError("Unsupported URL type")
     
-    async def process_url(self, url: str, script_params: Dict[str, Any] = None) -> str:
+    @staticmethod
+    def new_collection_id() -> str:
+        """Allocate the ID of a collection that has not been stored yet"""
+        return str(ObjectId())
+    
+    def validate_url(self, url: str) -> None:
+        """Check that a URL is supported, raising ValueError if it is not"""
+        self._get_url_processor(url).validate_url(url)
+    
+    def validate_upload(self, file: UploadFile) -> None:
+        """Check that an upload has a supported file type, raising ValueError if not"""
+        if not file or not hasattr(file, 'filename') or not file.filename:
+            raise ValueError("Invalid file upload")
+        
+        # Get file extension
+        ext = "." + get_file_extension(file.filename)
+        if ext not in self.file_processors:
+            supported_types = ", ".join(self.file_processors.keys())
+            raise ValueError(f"Unsupported file type: {ext}. Supported types: {supported_types}")
+    
+    async def _store_and_publish(self, collection: Collection, message_data: Dict[str, Any],
+                                 collection_id: Optional[str] = None) -> str:
+        """Insert a collection and publish its message concurrently
+        
+        The collection ID is generated up front (or allocated earlier by the
+        caller) so the message does not have to wait for the insert. If
+        publishing fails, the stored collection is deleted again so no
+        collection exists that consumers never heard of.
+        """
+        collection.id = collection_id or self.new_collection_id()
+        message_data["collection_id"] = collection.id
+        
+        insert_result, publish_result = await asyncio.gather(
+            self.repository.insert(collection),
+            self.message_broker.publish_data_collected(message_data),
+            return_exceptions=True
+        )
+        
+        if isinstance(publish_result, BaseException):
+            if not isinstance(insert_result, BaseException):
+                try:
+                    await self.repository.delete(collection.id)
+                except Exception as e:
+                    logger.error(f"Failed to remove unpublished collection {collection.id}: {str(e)}")
+            raise publish_result
+        if isinstance(insert_result, BaseException):
+            logger.error(f"Collection {collection.id} was published but could not be stored")
+            raise insert_result
+        return insert_result
+    
+    async def process_url(self, url: str, script_params: Dict[str, Any] = None,
+                          collection_id: Optional[str] = None) -> str:
         """Process URL and store as collection"""
         try:
             # Ensure message broker is connected
@@ -91,8 +191,8 @@ class CollectionService:
             # Get appropriate processor for URL
             processor = self._get_url_processor(url)
             
-            # Process the URL
-            result = processor.process(url)
+            # Process the URL; the HTTP fetch is async
+            result = await processor.process(url)
             content = result.get("content", "")
             metadata = result.get("metadata", {})
             title = metadata.get("title", "Article")
@@ -100,28 +200,29 @@ class CollectionService:
             # Get the source type for cleaning
             source_type = metadata.get("source", "web")
             
-            # Clean the data before storage
+            # Clean the data before storage, off the event loop since the
+            # regex passes over a full article are CPU-bound
             cleaner = CleanerFactory.get_cleaner(source_type)
             
-            cleaned_data = cleaner.clean({
+            cleaned_data = await asyncio.to_thread(cleaner.clean, {
                 "content": content,
                 "metadata": metadata
             })
+            cleaned_content = cleaned_data["content"]
+            cleaned_metadata = cleaned_data["metadata"]
             # Add timestamp for when the content was collected and cleaned
-            cleaned_data["metadata"]["collected_at"] = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S") 
+            cleaned_metadata["collected_at"] = utc_timestamp()
             
-            # Create and store collection
-            collection = Collection(
+            # Create collection from the trusted processor/cleaner output,
+            # sharing the cleaned metadata dict instead of copying it
+            collection = Collection.model_construct(
                 title=title,
-                content=cleaned_data["content"],
+                content=cleaned_content,
                 url=url,
-                scientific_topics=cleaned_data["metadata"].get("scientific_topics", []),
-                metadata=cleaned_data["metadata"]
+                scientific_topics=cleaned_metadata.get("scientific_topics", []),
+                metadata=cleaned_metadata
             )
             
-            collection_id = await self.repository.insert(collection)
-            logger.info(f"Collection stored with ID: {collection_id}")
-            
             # Default script parameters if none provided
             default_params = {
                 "script_type": "educational",
@@ -133,19 +234,19 @@ class CollectionService:
             # Merge default parameters with provided parameters
             script_params = {**default_params, **(script_params or {})}
             logger.info(f"Script parameters: {script_params}")
-            # Publish to message broker
+            # Store and publish to message broker
             message_data = {
-                "content": cleaned_data["content"],
-                "metadata": cleaned_data["metadata"],
-                "collection_id": collection_id,
+                "content": cleaned_content,
+                "metadata": cleaned_metadata,
+                "collection_id": None,  # Set by _store_and_publish
                 "source_type": "url",
                 "source_name": url,
                 **script_params  # Include all script generation parameters
             }
             logger.info(message_data)
-            logger.info("Publishing message to broker...")
-            await self.message_broker.publish_data_collected(message_data)
-            logger.info("Message published successfully")
+            logger.info("Storing collection and publishing message to broker...")
+            collection_id = await self._store_and_publish(collection, message_data, collection_id)
+            logger.info(f"Collection stored and published with ID: {collection_id}")
             
             return collection_id
             
@@ -153,61 +254,64 @@ class CollectionService:
             logger.error(f"Error processing URL: {str(e)}")
             raise
     
-    async def process_file(self, file: UploadFile, config: Dict[str, Any]) -> Dict[str, Any]:
+    async def process_file(self, file: UploadFile, config: Dict[str, Any],
+                           collection_id: Optional[str] = None) -> Dict[str, Any]:
         """Process uploaded file and publish to message broker"""
+        try:
+            self.validate_upload(file)
+        except ValueError as e:
+            logger.error(f"Error processing file: {str(e)}")
+            raise
+        
+        # Read the upload without blocking the event loop
+        content = await self.read_upload(file)
+        return await self.process_file_content(
+            content, file.filename, file.content_type, config, collection_id
+        )
+    
+    async def process_file_content(self, content: bytes, filename: str, content_type: Optional[str],
+                                   config: Dict[str, Any], collection_id: Optional[str] = None) -> Dict[str, Any]:
+        """Process the content of an uploaded file and publish to message broker"""
         try:
             # Ensure message broker connection
             await self.ensure_connected()
-            if not file or not hasattr(file, 'filename') or not file.filename:
-                raise ValueError("Invalid file upload")
-            
-            # Get file extension
-            filename = file.filename
-            ext = "." + get_file_extension(filename)
-            if ext not in self.file_processors:
-                supported_types = ", ".join(self.file_processors.keys())
-                raise ValueError(f"Unsupported file type: {ext}. Supported types: {supported_types}")
             
-            logger.info(f"Processing file: {file.filename} with config: {config}")
+            logger.info(f"Processing file: {filename} with config: {config}")
             
-             # Use the appropriate processor
-            processor = self.file_processors[ext]
-            result = processor.process(file)
+            # Parse off the event loop since parsing large files is CPU-bound
+            processor = self.file_processors["." + get_file_extension(filename)]
+            result = await asyncio.to_thread(processor.process_bytes, content, filename)
                 
             # Create message data
             message_data = {
                 "content": result["content"],
-                "filename": file.filename,
-                "content_type": file.content_type,
+                "filename": filename,
+                "content_type": content_type,
                 "source_type": "file_upload",
-                "collection_id": None  # Will be set after DB insert
+                "collection_id": None  # Set by _store_and_publish
             }
                 
             # Add all config fields to message data
             message_data.update(config)
                 
-            # Create a collection object
-            collection = Collection(
-                title=f"File: {file.filename}",
+            # Create a collection object; every field is built here from
+            # processor output, so validation is skipped
+            collection = Collection.model_construct(
+                title=f"File: {filename}",
                 content=result["content"],
                 url=None,
                 scientific_topics=[],
                 metadata={
                     "source": "file_upload",
-                    "filename": file.filename,
-                    "content_type": file.content_type,
+                    "filename": filename,
+                    "content_type": content_type,
                 **config
             }
             )
                 
-                # Save to database
-            collection_id = await self.repository.insert(collection)
-            message_data["collection_id"] = collection_id
-
-            # Publish to message broker
-            logger.info(f"Publishing file data to message broker, collection_id: {collection_id}")
-            await self.message_broker.publish_data_collected(message_data)
-            logger.info("File data published successfully")
+            # Save to database and publish to message broker
+            collection_id = await self._store_and_publish(collection, message_data, collection_id)
+            logger.info(f"File data stored and published successfully, collection_id: {collection_id}")
 
             return {
                 "status": "success",
@@ -219,7 +323,28 @@ class CollectionService:
             logger.error(f"Error processing file: {str(e)}", exc_info=True)
             raise
     
-    async def process_script(self, content: str, title: str, metadata: Optional[Dict[str, Any]] = None) -> str:
+    async def read_upload(self, file: UploadFile) -> bytes:
+        """Read an uploaded file in chunks with async I/O
+        
+        Uploads up to UPLOAD_SPOOL_SIZE are already in memory, larger ones
+        are spooled to a temporary file by Starlette; either way this is the
+        one place the upload is read, for the parsers.
+        Reading stops with UploadTooLargeError as soon as more than
+        MAX_FILE_SIZE bytes have been read, whatever the request headers said.
+        """
+        max_size = get_settings().MAX_FILE_SIZE
+        await file.seek(0)
+        chunks = []
+        total_read = 0
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            total_read += len(chunk)
+            if total_read > max_size:
+                raise UploadTooLargeError(f"File is larger than the {max_size} byte limit")
+            chunks.append(chunk)
+        return b"".join(chunks)
+    
+    async def process_script(self, content: str, title: str, metadata: Optional[Dict[str, Any]] = None,
+                             collection_id: Optional[str] = None) -> str:
         """
         Process a submitted script and create a collection
         
@@ -227,6 +352,7 @@ class CollectionService:
             content: The script content
             title: The title of the script
             metadata: Optional metadata about the script
+            collection_id: ID allocated with new_collection_id(), if any
             
         Returns:
             The ID of the created collection
@@ -243,14 +369,10 @@ class CollectionService:
                 **metadata # Use provided metadata or empty dict
             )
             
-            # Save collection to database
-            collection_id = await self.repository.insert(collection)
-            logger.info(f"Script collection created with ID: {collection_id}")
-            
             # Prepare message data for processing queue
             message_data = {
                 "content": content,
-                "collection_id": collection_id,
+                "collection_id": None,  # Set by _store_and_publish
                 "source_type": "user_script",
                 "title": title
             }
@@ -261,11 +383,10 @@ class CollectionService:
                     if key not in message_data:  # Avoid overwriting existing fields
                         message_data[key] = value
             
-            # Publish to processing queue
-            logger.info(f"Publishing script collection to queue: {collection_id}")
+            # Save collection to database and publish to processing queue
             logger.info(f"Message data: {message_data}")
-            await self.message_broker.publish_data_collected(message_data)
-            logger.info(f"Script collection published successfully: {collection_id}")
+            collection_id = await self._store_and_publish(collection, message_data, collection_id)
+            logger.info(f"Script collection created and published successfully: {collection_id}")
             
             return str(collection_id)
         except Exception as e:
@@ -273,29 +394,78 @@ class CollectionService:
             raise
     
     async def get_collection(self, collection_id: str) -> Optional[Collection]:
-        """Get a collection by ID"""
-        return await self.repository.find_by_id(collection_id)
+        """Get a collection by ID
+        
+        Found collections are cached per ID (LRU with TTL) and invalidated
+        by update_collection() and delete_collection(); concurrent misses for
+        the same ID share one database read. Missing IDs are not cached, so
+        a queued collection shows up as soon as it is stored. Every caller
+        gets its own copy, so changes to it do not reach the cache.
+        
+        Invalidation only reaches this process. With several workers, an
+        update or delete handled by another worker shows up here once the
+        entry expires, after at most COLLECTION_CACHE_TTL seconds (0
+        disables the cache).
+        """
+        cached = self._collection_cache.get(collection_id)
+        if cached and time.monotonic() - cached[0] < self.collection_cache_ttl:
+            self._collection_cache.move_to_end(collection_id)
+            return cached[1].model_copy(deep=True)
+        
+        load = self._collection_loads.get(collection_id)
+        if load is None:
+            load = asyncio.ensure_future(self._load_collection(collection_id))
+            self._collection_loads[collection_id] = load
+            load.add_done_callback(lambda task: self._finish_collection_load(collection_id, task))
+        collection = await asyncio.shield(load)
+        return collection.model_copy(deep=True) if collection is not None else None
+    
+    async def _load_collection(self, collection_id: str) -> Optional[Collection]:
+        """Read a collection from the database and cache it"""
+        loaded_at = time.monotonic()
+        collection = await self.repository.find_by_id(collection_id)
+        # Skip caching if the ID was invalidated while the read was running
+        if (collection is not None and self.collection_cache_ttl > 0
+                and self._collection_loads.get(collection_id) is asyncio.current_task()):
+            self._collection_cache[collection_id] = (loaded_at, collection)
+            self._collection_cache.move_to_end(collection_id)
+            if len(self._collection_cache) > self.COLLECTION_CACHE_SIZE:
+                self._collection_cache.popitem(last=False)
+        return collection
+    
+    def _finish_collection_load(self, collection_id: str, task: asyncio.Future) -> None:
+        """Forget a finished collection read unless it was replaced"""
+        if self._collection_loads.get(collection_id) is task:
+            del self._collection_loads[collection_id]
     
-    def get_all_collections(self, limit: int = 100) -> List[Collection]:
-        """Get all collections"""
-        return self.repository.find_all(limit)
+    def _invalidate_collection(self, collection_id: str) -> None:
+        """Drop a collection from the read cache"""
+        self._collection_cache.pop(collection_id, None)
+        self._collection_loads.pop(collection_id, None)
+    
+    def iter_all_collections_raw(self, limit: int = 100) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all collections as response-shaped dicts"""
+        return self.repository.iter_all_raw(limit)
     
     def find_by_title(self, title: str) -> Optional[Collection]:
         """Find a collection by title"""
         return self.repository.find_by_title(title)
     
-    def delete_collection(self, collection_id: str) -> bool:
+    async def delete_collection(self, collection_id: str) -> bool:
         """Delete a collection by ID"""
-        return self.repository.delete(collection_id)
+        try:
+            return await self.repository.delete(collection_id)
+        finally:
+            self._invalidate_collection(collection_id)
     
-    def get_related_articles(self, collection_id: str) -> List[Dict[str, str]]:
-        """Get related articles for a collection"""
-        collection = self.get_collection(collection_id)
+    async def get_related_articles(self, collection_id: str) -> Optional[List[Dict[str, str]]]:
+        """Get related articles for a collection, or None if it does not exist"""
+        collection = await self.get_collection(collection_id)
         if not collection:
-            return []
+            return None
             
         if collection.url and is_wikipedia_url(collection.url):
-            return self.url_processors['wikipedia'].get_related_articles(collection.title)
+            return await self.url_processors['wikipedia'].get_related_articles(collection.title)
         
         # For files or other content types, we might implement different related content logic
         # For now, return empty list for non-Wikipedia content
@@ -317,4 +487,6 @@ class CollectionService:
             return await self.repository.update(collection)
         except Exception as e:
             logger.error(f"Error updating collection: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+        finally:
+            self._invalidate_collection(collection.id)
\ No newline at end of file
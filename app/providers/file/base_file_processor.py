@@ -1,5 +1,6 @@
 from abc import abstractmethod
-from typing import BinaryIO, Dict, Any
+from typing import BinaryIO, Dict, Any, Optional
+from app.config import get_settings
 from app.providers.base_content_processor import BaseContentProcessor
 import io
 
@@ -7,18 +8,44 @@ class FileContentProcessor(BaseContentProcessor):
     """Base class for all file content processors"""
     
     def __init__(self):
-        self.max_file_size = 10 * 1024 * 1024  # 10MB default
+        # Same limit the upload routes enforce
+        self.max_file_size = get_settings().MAX_FILE_SIZE
     
     def process(self, input_data: BinaryIO) -> Dict[str, Any]:
-        """Main processing method implementing BaseContentProcessor interface"""
-        self.validate_file(input_data)
-        return self.process_file(input_data)
+        """Main processing method implementing BaseContentProcessor interface
+        
+        The file is read into memory once and parsed from that buffer, so
+        parsers never go back to a (possibly disk-spooled) upload.
+        """
+        content = self.read_file(input_data)
+        return self.process_file(io.BytesIO(content), getattr(input_data, 'filename', None))
+    
+    def process_bytes(self, content: bytes, filename: Optional[str] = None) -> Dict[str, Any]:
+        """Process file content that has already been read into memory"""
+        buffer = io.BytesIO(content)
+        self.validate_file(buffer)
+        return self.process_file(buffer, filename)
+    
+    def read_file(self, file: BinaryIO) -> bytes:
+        """Validate the file and read its whole content"""
+        self.validate_file(file)
+        
+        # For FastAPI UploadFile objects
+        file_obj = file.file if hasattr(file, 'file') else file
+        if isinstance(file_obj, io.BytesIO):
+            return file_obj.getvalue()
+        
+        file_obj.seek(0)
+        return file_obj.read()
     
     def validate_file(self, file: BinaryIO) -> None:
         """Common validation for all file types"""
         # Check if file is empty
         if isinstance(file, io.BytesIO):
-            size = len(file.getvalue())
+            size = file.getbuffer().nbytes
+        elif getattr(file, 'size', None) is not None:
+            # FastAPI UploadFile objects know their size from the upload
+            size = file.size
         elif hasattr(file, 'file'):
             # For FastAPI UploadFile objects
             file.file.seek(0, 2)  # Go to end of file
@@ -37,6 +64,11 @@ class FileContentProcessor(BaseContentProcessor):
             raise ValueError(f"File exceeds maximum size of {self.max_file_size / (1024 * 1024)}MB")
     
     @abstractmethod
-    def process_file(self, file: BinaryIO) -> Dict[str, Any]:
-        """Process the specific file type and extract content"""
+    def process_file(self, file: BinaryIO, filename: Optional[str] = None) -> Dict[str, Any]:
+        """Process the specific file type and extract content
+        
+        Args:
+            file: In-memory binary file positioned at the start
+            filename: Name of the uploaded file, if known
+        """
         pass
\ No newline at end of file
@@ -1,33 +1,17 @@
-from typing import BinaryIO, Dict, Any
+from typing import BinaryIO, Dict, Any, Iterator, Optional
 from docx import Document
 from app.providers.file.base_file_processor import FileContentProcessor
-from app.utils.helpers import extract_topics
 
 class DOCXProcessor(FileContentProcessor):
     """Processor for DOCX files"""
     
-    def process_file(self, file: BinaryIO) -> Dict[str, Any]:
+    def process_file(self, file: BinaryIO, filename: Optional[str] = None) -> Dict[str, Any]:
         """Extract text from DOCX file"""
-        # Handle FastAPI UploadFile objects
-        if hasattr(file, 'file'):
-            file_obj = file.file
-            # Store filename for later use
-            filename = getattr(file, 'filename', 'unknown.docx')
-        else:
-            file_obj = file
-            filename = getattr(file, 'filename', 'unknown.docx')
-            
-        doc = Document(file_obj)
+        filename = filename or 'unknown.docx'
+        doc = Document(file)
         
-        # Extract text from paragraphs
-        paragraphs = [paragraph.text for paragraph in doc.paragraphs]
-        text = "\n".join(paragraphs)
-        
-        # Extract text from tables
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    text += cell.text + "\n"
+        # Extract text from paragraphs and tables in a single join
+        text = "\n".join(self._iter_text(doc))
         
         # Extract metadata from document properties
         metadata = {}
@@ -54,4 +38,14 @@ class DOCXProcessor(FileContentProcessor):
                 "extraction_method": "python-docx",
                 "filename": filename
             }
-        }
\ No newline at end of file
+        }
+    
+    @staticmethod
+    def _iter_text(doc) -> Iterator[str]:
+        """Yield the text of every paragraph, then of every table cell"""
+        for paragraph in doc.paragraphs:
+            yield paragraph.text
+        for table in doc.tables:
+            for row in table.rows:
+                for cell in row.cells:
+                    yield cell.text
\ No newline at end of file
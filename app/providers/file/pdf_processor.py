@@ -1,42 +1,38 @@
-from typing import BinaryIO, Dict, Any
-from PyPDF2 import PdfReader
+from typing import BinaryIO, Dict, Any, Optional
+import fitz
 from app.providers.file.base_file_processor import FileContentProcessor
-from app.utils.helpers import extract_topics
-import io
 
 class PDFProcessor(FileContentProcessor):
     """Processor for PDF files"""
     
-    def process_file(self, file: BinaryIO) -> Dict[str, Any]:
+    def process_file(self, file: BinaryIO, filename: Optional[str] = None) -> Dict[str, Any]:
         """Extract text from PDF file"""
         try:
-            # Ensure we're at the start of the file
-            if isinstance(file, io.BytesIO):
-                file.seek(0)
-            elif hasattr(file, 'file'):
-                # For FastAPI UploadFile objects
-                file = file.file
-                file.seek(0)
+            # For FastAPI UploadFile objects
+            file_obj = file.file if hasattr(file, 'file') else file
+            data = file_obj.getvalue() if hasattr(file_obj, 'getvalue') else file_obj.read()
             
-            reader = PdfReader(file)
-            text = ""
-            metadata = {}
-            
-            # Extract text from pages
-            for page in reader.pages:
-                text += page.extract_text() or ""
-                text += "\n"  # Add newline between pages
-            
-            # Extract document information
-            if reader.metadata:
-                metadata = {
-                    "title": reader.metadata.get("/Title", ""),
-                    "author": reader.metadata.get("/Author", ""),
-                    "subject": reader.metadata.get("/Subject", ""),
-                    "creator": reader.metadata.get("/Creator", ""),
-                    "producer": reader.metadata.get("/Producer", ""),
-                    "page_count": len(reader.pages)
-                }
+            with fitz.open(stream=data, filetype="pdf") as doc:
+                metadata = {}
+                
+                # Extract text from pages, joined once at the end
+                parts = []
+                append = parts.append
+                for page in doc:
+                    append(self._page_text(page))
+                    append("\n")  # Add newline between pages
+                text = "".join(parts)
+                
+                # Extract document information
+                if doc.metadata:
+                    metadata = {
+                        "title": doc.metadata.get("title", ""),
+                        "author": doc.metadata.get("author", ""),
+                        "subject": doc.metadata.get("subject", ""),
+                        "creator": doc.metadata.get("creator", ""),
+                        "producer": doc.metadata.get("producer", ""),
+                        "page_count": doc.page_count
+                    }
             
             return {
                 "content": text,
@@ -44,9 +40,20 @@ class PDFProcessor(FileContentProcessor):
                     **metadata,
                     "source": "file_upload",
                     "file_type": "pdf",
-                    "extraction_method": "PyPDF2",
-                    "filename": getattr(file, 'filename', 'unknown.pdf')
+                    "extraction_method": "PyMuPDF",
+                    "filename": filename or 'unknown.pdf'
                 }
             }
         except Exception as e:
-            raise ValueError(f"Error processing PDF file: {str(e)}") 
\ No newline at end of file
+            raise ValueError(f"Error processing PDF file: {str(e)}") 
+    
+    @staticmethod
+    def _page_text(page) -> str:
+        """Extract the plain text of a single page
+        
+        Pages without fonts in their resources (scanned images) carry no
+        text operators, so their content streams are never decoded.
+        """
+        if not page.get_fonts():
+            return ""
+        return page.get_text("text")
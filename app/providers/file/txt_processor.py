@@ -1,30 +1,20 @@
-from typing import BinaryIO, Dict, Any
+from typing import BinaryIO, Dict, Any, Optional
 from app.providers.file.base_file_processor import FileContentProcessor
-from app.utils.helpers import extract_topics
 
 class TXTProcessor(FileContentProcessor):
     """Processor for TXT files"""
     
-    def process_file(self, file: BinaryIO) -> Dict[str, Any]:
+    def process_file(self, file: BinaryIO, filename: Optional[str] = None) -> Dict[str, Any]:
         """Extract text from TXT file"""
+        filename = filename or 'unknown.txt'
+        # Read the bytes once; both decoding attempts share the same buffer
+        data = file.getvalue() if hasattr(file, 'getvalue') else file.read()
         try:
-            # Handle FastAPI UploadFile objects
-            if hasattr(file, 'file'):
-                file_obj = file.file
-                # Store filename for later use
-                filename = getattr(file, 'filename', 'unknown.txt')
-            else:
-                file_obj = file
-                filename = getattr(file, 'filename', 'unknown.txt')
-                
             # Try UTF-8 encoding first
-            file_obj.seek(0)
-            text = file_obj.read().decode('utf-8')
+            text = data.decode('utf-8')
         except UnicodeDecodeError:
             # If UTF-8 fails, try Latin-1 (should always work)
-            file_obj.seek(0)
-            text = file_obj.read().decode('latin-1')
-        
+            text = data.decode('latin-1')
         
         return {
             "content": text,
@@ -1,6 +1,6 @@
 from typing import Dict, Any
 from app.providers.base_content_processor import BaseContentProcessor
-from app.utils.helpers import extract_topics
+from app.utils.helpers import extract_topics_cached
 
 class ScriptProcessor(BaseContentProcessor):
     """Processor for video script content"""
@@ -18,17 +18,18 @@ class ScriptProcessor(BaseContentProcessor):
             raise TypeError("Input must be a string containing script content")
         
         # Extract scientific topics from the script content
-        scientific_topics = extract_topics(input_data)
+        scientific_topics = extract_topics_cached(input_data)
         
-        # Basic script analysis
-        lines = input_data.split('\n')
+        # Basic script analysis; lines are counted without building a list,
+        # while str.split() is the fastest way to count words
+        line_count = input_data.count('\n') + 1
         word_count = len(input_data.split())
         
         return {
             "content": input_data,
             "metadata": {
                 "source": "video_script",
-                "line_count": len(lines),
+                "line_count": line_count,
                 "word_count": word_count,
                 "scientific_topics": scientific_topics
             }
@@ -1,23 +1,67 @@
 from abc import abstractmethod
-from typing import Dict, Any, List
-import requests
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+import hishel
+import httpx
+from app.config import get_settings
 from app.providers.base_content_processor import BaseContentProcessor
 
 class BaseURLProcessor(BaseContentProcessor):
-    """Base class for all URL content processors"""
+    """Base class for all URL content processors
+    
+    All URL processors share one pooled HTTP/2 client, created on first use
+    and closed with aclose() on application shutdown. Responses are cached
+    as their cache headers allow, for at most HTTP_CACHE_TTL. The cache is
+    kept in memory unless HTTP_CACHE_DIR is set.
+    """
+    
+    _client: Optional[httpx.AsyncClient] = None
     
     def __init__(self):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
     
-    def process(self, url: str) -> Dict[str, Any]:
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared HTTP client for all URL processors"""
+        client = BaseURLProcessor._client
+        if client is None or client.is_closed:
+            settings = get_settings()
+            # The disk cache is opt-in: serverless deployments (see
+            # api/index.py) run on a read-only filesystem
+            if settings.HTTP_CACHE_DIR:
+                storage = hishel.AsyncFileStorage(
+                    base_path=Path(settings.HTTP_CACHE_DIR),
+                    ttl=settings.HTTP_CACHE_TTL
+                )
+            else:
+                storage = hishel.AsyncInMemoryStorage(ttl=settings.HTTP_CACHE_TTL)
+            client = BaseURLProcessor._client = hishel.AsyncCacheClient(
+                storage=storage,
+                http2=True,
+                headers=self.headers,
+                limits=httpx.Limits(max_connections=32),
+                timeout=30.0,
+                follow_redirects=True
+            )
+        return client
+    
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close the shared HTTP client"""
+        client = BaseURLProcessor._client
+        BaseURLProcessor._client = None
+        if client is not None:
+            await client.aclose()
+    
+    async def process(self, url: str) -> Dict[str, Any]:
         """Process a URL and extract its content"""
         self.validate_url(url)
-        return self.process_url(url)
+        return await self.process_url(url)
     
     @abstractmethod
-    def process_url(self, url: str) -> Dict[str, Any]:
+    async def process_url(self, url: str) -> Dict[str, Any]:
         """Process the specific URL and extract content"""
         pass
     
@@ -26,8 +70,8 @@ class BaseURLProcessor(BaseContentProcessor):
         """Validate that the URL is supported by this processor"""
         pass
     
-    def fetch_url_content(self, url: str) -> str:
+    async def fetch_url_content(self, url: str) -> str:
         """Fetch the content of a URL"""
-        response = requests.get(url, headers=self.headers)
+        response = await self.client.get(url)
         response.raise_for_status()
-        return response.text
\ No newline at end of file
+        return response.text
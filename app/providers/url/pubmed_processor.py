@@ -1,73 +1,80 @@
+import asyncio
+import logging
 import re
-from typing import Dict, Any, List
-import requests
-from bs4 import BeautifulSoup
+from typing import Dict, Any, List, Optional
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
 from app.providers.url.base_url_processor import BaseURLProcessor
-from app.utils.helpers import extract_topics
+from app.utils.helpers import extract_topics_cached
+
+logger = logging.getLogger(__name__)
+
+_PUBMED_URL = re.compile(r'^https?://(www\.)?pubmed\.ncbi\.nlm\.nih\.gov/\d+')
+_PMID = re.compile(r'/(\d+)/?$')
+
+def _pubmed_field(name: str, attrs: Dict[str, Any]) -> Optional[str]:
+    """Name the article field an element holds, if it is one the processor reads"""
+    classes = attrs.get('class') or ()
+    if isinstance(classes, str):
+        classes = classes.split()
+    
+    if name == 'h1' and 'heading-title' in classes:
+        return 'title'
+    if name == 'div':
+        if attrs.get('id') == 'abstract':
+            return 'abstract'
+        if 'authors-list' in classes:
+            return 'authors'
+    if name == 'span':
+        if 'cit' in classes:
+            return 'date'
+        if 'identifier' in classes and 'doi' in classes:
+            return 'doi'
+    return None
+
+# efetch responses carry a DOCTYPE; never resolve entities or fetch DTDs
+_XML_PARSER = etree.XMLParser(resolve_entities=False, no_network=True)
+
+# Only the elements holding article fields (and their children) are parsed
+_ARTICLE_STRAINER = SoupStrainer(lambda name, attrs: _pubmed_field(name, attrs) is not None)
 
 class PubMedProcessor(BaseURLProcessor):
     """Processor for PubMed URLs"""
     
+    EFETCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
+    
     def validate_url(self, url: str) -> None:
         """Validate that the URL is a PubMed article"""
-        pattern = r'^https?://(www\.)?pubmed\.ncbi\.nlm\.nih\.gov/\d+'
-        if not re.match(pattern, url):
+        if not _PUBMED_URL.match(url):
             raise ValueError("The URL is not a valid PubMed article URL")
     
-    def process_url(self, url: str) -> Dict[str, Any]:
+    async def process_url(self, url: str) -> Dict[str, Any]:
         """Process a PubMed URL and extract its content"""
         try:
-            # Fetch the HTML content
-            html_content = self.fetch_url_content(url)
-            
-            # Parse HTML with BeautifulSoup
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Extract title
-            title = soup.find('h1', {'class': 'heading-title'}).text.strip()
-            
-            # Extract abstract
-            abstract_div = soup.find('div', {'id': 'abstract'})
-            if abstract_div:
-                abstract = abstract_div.text.strip()
-            else:
-                abstract = "Abstract not available."
+            # Extract PMID
+            pmid = _PMID.search(url).group(1)
             
-            # Extract authors
-            authors_list = []
-            authors_section = soup.find('div', {'class': 'authors-list'})
-            if authors_section:
-                authors = authors_section.find_all('span', {'class': 'authors-list-item'})
-                for author in authors:
-                    authors_list.append(author.text.strip())
+            # Fetch the article record from E-utilities; scrape the HTML page
+            # only if the API fails
+            article = await self._fetch_article_via_api(pmid)
+            if article is None:
+                html_content = await self.fetch_url_content(url)
+                article = await asyncio.to_thread(self._extract_article_from_html, html_content)
             
-            # Extract publication date
-            pub_date = ""
-            date_elem = soup.find('span', {'class': 'cit'})
-            if date_elem:
-                pub_date = date_elem.text.strip()
+            abstract = article["abstract"] or "Abstract not available."
             
             # Extract scientific topics from content
-            scientific_topics = extract_topics(abstract)
-            
-            # Extract DOI if available
-            doi = ""
-            doi_elem = soup.find('span', {'class': 'identifier doi'})
-            if doi_elem:
-                doi = doi_elem.text.strip().replace('doi: ', '')
-            
-            # Extract PMID
-            pmid = re.search(r'/(\d+)/?$', url).group(1)
+            scientific_topics = extract_topics_cached(abstract)
             
             # Extract metadata
             metadata = {
-                "title": title,
+                "title": article["title"],
                 "url": url,
                 "source": "pubmed",
                 "pmid": pmid,
-                "doi": doi,
-                "authors": authors_list,
-                "publication_date": pub_date,
+                "doi": article["doi"],
+                "authors": article["authors"],
+                "publication_date": article["publication_date"],
                 "scientific_topics": scientific_topics
             }
             
@@ -77,5 +84,101 @@ class PubMedProcessor(BaseURLProcessor):
             }
             
         except Exception as e:
-            print(f"Error processing PubMed URL: {e}")
-            raise
\ No newline at end of file
+            logger.error("Error processing PubMed URL %s: %s", url, e, exc_info=True)
+            raise
+    
+    async def _fetch_article_via_api(self, pmid: str) -> Optional[Dict[str, Any]]:
+        """Fetch an article record with E-utilities efetch, returning None on failure"""
+        params = {"db": "pubmed", "id": pmid, "retmode": "xml"}
+        
+        try:
+            response = await self.client.get(self.EFETCH_URL, params=params)
+            response.raise_for_status()
+            root = etree.fromstring(response.content, parser=_XML_PARSER)
+            
+            article = root.find("PubmedArticle/MedlineCitation/Article")
+            if article is None:
+                return None
+            
+            title = "".join(article.find("ArticleTitle").itertext()).strip()
+            
+            # Structured abstracts are split into labelled sections
+            sections = []
+            for section in article.iterfind("Abstract/AbstractText"):
+                text = "".join(section.itertext()).strip()
+                label = section.get("Label")
+                sections.append(f"{label}: {text}" if label else text)
+            
+            authors_list = []
+            for author in article.iterfind("AuthorList/Author"):
+                name = author.findtext("CollectiveName") or " ".join(
+                    part for part in (author.findtext("ForeName"), author.findtext("LastName")) if part
+                )
+                if name:
+                    authors_list.append(name.strip())
+            
+            pub_date = article.find("Journal/JournalIssue/PubDate")
+            if pub_date is not None:
+                pub_date = pub_date.findtext("MedlineDate") or " ".join(
+                    part for part in (pub_date.findtext(key) for key in ("Year", "Month", "Day")) if part
+                )
+            
+            return {
+                "title": title,
+                "abstract": "\n".join(sections),
+                "authors": authors_list,
+                "publication_date": pub_date or "",
+                "doi": article.findtext("ELocationID[@EIdType='doi']") or ""
+            }
+        except Exception as e:
+            logger.warning("Error fetching PubMed article %s via API, falling back to HTML: %s", pmid, e)
+            return None
+    
+    def _extract_article_from_html(self, html_content: str) -> Dict[str, Any]:
+        """Extract article fields from the PubMed HTML page (fallback method)"""
+        # Parse only the article fields, with lxml
+        soup = BeautifulSoup(html_content, 'lxml', parse_only=_ARTICLE_STRAINER)
+        
+        # Collect the first element of each field in a single walk
+        fields = {}
+        for elem in soup.find_all(['h1', 'div', 'span']):
+            field = _pubmed_field(elem.name, elem.attrs)
+            if field and field not in fields:
+                fields[field] = elem
+        
+        # Extract title
+        title = fields['title'].text.strip()
+        
+        # Extract abstract
+        abstract = ""
+        abstract_div = fields.get('abstract')
+        if abstract_div:
+            abstract = abstract_div.text.strip()
+        
+        # Extract authors
+        authors_list = []
+        authors_section = fields.get('authors')
+        if authors_section:
+            authors = authors_section.find_all('span', {'class': 'authors-list-item'})
+            for author in authors:
+                authors_list.append(author.text.strip())
+        
+        # Extract publication date
+        pub_date = ""
+        date_elem = fields.get('date')
+        if date_elem:
+            pub_date = date_elem.text.strip()
+        
+        # Extract DOI if available
+        doi = ""
+        doi_elem = fields.get('doi')
+        if doi_elem:
+            doi = doi_elem.text.strip().replace('doi: ', '')
+        
+        return {
+            "title": title,
+            "abstract": abstract,
+            "authors": authors_list,
+            "publication_date": pub_date,
+            "doi": doi
+        }
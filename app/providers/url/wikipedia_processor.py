@@ -1,37 +1,53 @@
+import asyncio
 import re
-from typing import Dict, Any, List
-import requests
+import time
+import orjson
+import lxml.html
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
 from bs4 import BeautifulSoup
 from urllib.parse import unquote
 from app.providers.url.base_url_processor import BaseURLProcessor
-from app.utils.helpers import extract_topics
+from app.utils.helpers import extract_topics_cached, is_wikipedia_url
+
+_WIKI_PATH = re.compile(r'/wiki/([^?#]+)')
+_WIKI_LANGUAGE = re.compile(r'^https?://([a-z]{2})\.wikipedia\.org/wiki/')
 
 class WikipediaProcessor(BaseURLProcessor):
     """Processor for Wikipedia URLs"""
     
+    # Bounds for the related-articles cache; results go stale as Wikipedia
+    # changes, so entries also expire
+    RELATED_CACHE_SIZE = 1024
+    RELATED_CACHE_TTL = 3600  # seconds
+    
+    def __init__(self):
+        super().__init__()
+        self._related_cache: "OrderedDict[str, Tuple[float, List[Dict[str, str]]]]" = OrderedDict()
+        self._related_loads: Dict[str, asyncio.Future] = {}
+    
     def validate_url(self, url: str) -> None:
         """Validate that the URL is a Wikipedia article"""
-        pattern = r'^https?://(www\.)?([a-z]{2}\.)?wikipedia\.org/wiki/.+'
-        if not re.match(pattern, url):
+        if not is_wikipedia_url(url):
             raise ValueError("The URL is not a valid Wikipedia article URL")
     
-    def process_url(self, url: str) -> Dict[str, Any]:
+    async def process_url(self, url: str) -> Dict[str, Any]:
         """Process a Wikipedia URL and extract its content"""
         try:
             # Extract title from URL
-            title = self._extract_title_from_url(url)
+            title = await self._extract_title_from_url(url)
             language = self._detect_language(url)
             
             # Fetch full article text using Wikipedia API
-            content = self._fetch_full_article_text(title, language)
+            content = await self._fetch_full_article_text(title, language)
             
             # If API fails, fall back to HTML parsing
             if not content:
-                html_content = self.fetch_url_content(url)
-                content = self._extract_content_from_html(html_content)
+                html_content = await self.fetch_url_content(url)
+                content = await asyncio.to_thread(self._extract_content_from_html, html_content)
             
             # Extract scientific topics from content
-            scientific_topics = extract_topics(content)
+            scientific_topics = extract_topics_cached(content)
             
             # Extract metadata
             metadata = {
@@ -51,10 +67,10 @@ class WikipediaProcessor(BaseURLProcessor):
             print(f"Error processing Wikipedia URL: {e}")
             raise
     
-    def _extract_title_from_url(self, url: str) -> str:
+    async def _extract_title_from_url(self, url: str) -> str:
         """Extract the article title from a Wikipedia URL"""
         # Extract the path component after /wiki/
-        match = re.search(r'/wiki/([^?#]+)', url)
+        match = _WIKI_PATH.search(url)
         if match:
             # URL decode the title (replace underscores with spaces)
             encoded_title = match.group(1)
@@ -62,7 +78,7 @@ class WikipediaProcessor(BaseURLProcessor):
             return title
         
         # Fallback: fetch the HTML and extract the title
-        html_content = self.fetch_url_content(url)
+        html_content = await self.fetch_url_content(url)
         soup = BeautifulSoup(html_content, 'html.parser')
         title_elem = soup.find('h1', {'id': 'firstHeading'})
         if title_elem:
@@ -70,7 +86,7 @@ class WikipediaProcessor(BaseURLProcessor):
         
         raise ValueError("Could not extract title from Wikipedia URL")
     
-    def _fetch_full_article_text(self, title: str, language: str = "en") -> str:
+    async def _fetch_full_article_text(self, title: str, language: str = "en") -> str:
         """Fetch full Wikipedia article text, handling pagination if necessary.
         
         Args:
@@ -86,13 +102,14 @@ class WikipediaProcessor(BaseURLProcessor):
             "format": "json",
             "prop": "extracts",
             "explaintext": True,
+            "exlimit": 1,
             "titles": title,
             "formatversion": "2"
         }
         
         try:
-            response = requests.get(base_url, params=params)
-            data = response.json()
+            response = await self.client.get(base_url, params=params)
+            data = orjson.loads(response.content)
             # Extract text from the response
             if "query" in data and "pages" in data["query"]:
                 page = data["query"]["pages"][0]
@@ -107,29 +124,63 @@ class WikipediaProcessor(BaseURLProcessor):
     
     def _extract_content_from_html(self, html_content: str) -> str:
         """Extract article content from HTML (fallback method)"""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # Find the main content div
-        content_div = soup.find('div', {'id': 'mw-content-text'})
-        if not content_div:
-            return ""
+        tree = lxml.html.fromstring(html_content)
         
-        # Extract all paragraphs
-        paragraphs = content_div.find_all('p')
+        # Extract all paragraphs of the main content div
+        paragraphs = tree.xpath("//div[@id='mw-content-text']//p")
         
         # Concatenate paragraphs into a single text
-        content = '\n\n'.join([p.text for p in paragraphs if p.text.strip()])
+        texts = (p.text_content() for p in paragraphs)
+        content = '\n\n'.join(text for text in texts if text.strip())
         
         return content
     
-    def get_related_articles(self, title: str) -> List[Dict[str, str]]:
-        """Get related articles for a Wikipedia title"""
+    async def get_related_articles(self, title: str) -> List[Dict[str, str]]:
+        """Get related articles for a Wikipedia title
+        
+        Successful lookups are cached per title (LRU with TTL); failed ones
+        are not, so they are retried on the next call. Concurrent misses for
+        the same title share one search, as in CollectionService.get_collection.
+        """
+        cached = self._related_cache.get(title)
+        if cached and time.monotonic() - cached[0] < self.RELATED_CACHE_TTL:
+            self._related_cache.move_to_end(title)
+            return [dict(article) for article in cached[1]]
+        
+        load = self._related_loads.get(title)
+        if load is None:
+            load = asyncio.ensure_future(self._load_related_articles(title))
+            self._related_loads[title] = load
+            load.add_done_callback(lambda task: self._finish_related_load(title, task))
+        related_articles = await asyncio.shield(load)
+        if related_articles is None:
+            return []
+        return [dict(article) for article in related_articles]
+    
+    async def _load_related_articles(self, title: str) -> Optional[List[Dict[str, str]]]:
+        """Search for related articles and cache a successful result"""
+        loaded_at = time.monotonic()
+        related_articles = await self._search_related_articles(title)
+        if related_articles is not None:
+            self._related_cache[title] = (loaded_at, related_articles)
+            self._related_cache.move_to_end(title)
+            if len(self._related_cache) > self.RELATED_CACHE_SIZE:
+                self._related_cache.popitem(last=False)
+        return related_articles
+    
+    def _finish_related_load(self, title: str, task: asyncio.Future) -> None:
+        """Forget a finished search unless it was replaced"""
+        if self._related_loads.get(title) is task:
+            del self._related_loads[title]
+    
+    async def _search_related_articles(self, title: str) -> Optional[List[Dict[str, str]]]:
+        """Search Wikipedia for related articles, returning None on failure"""
         try:
             # Construct URL for Wikipedia API
             api_url = f"https://en.wikipedia.org/w/api.php?action=query&list=search&srsearch={title}&format=json&utf8=1&srlimit=5"
             
             # Fetch data from API
-            response = requests.get(api_url, headers=self.headers)
+            response = await self.client.get(api_url)
             data = response.json()
             
             # Extract search results
@@ -153,11 +204,11 @@ class WikipediaProcessor(BaseURLProcessor):
             
         except Exception as e:
             print(f"Error getting related articles: {e}")
-            return []
+            return None
     
     def _detect_language(self, url: str) -> str:
         """Detect language from Wikipedia URL"""
-        match = re.match(r'^https?://([a-z]{2})\.wikipedia\.org/wiki/', url)
+        match = _WIKI_LANGUAGE.match(url)
         if match:
             return match.group(1)
         return "en"  # Default to English
\ No newline at end of file
@@ -1,19 +1,30 @@
 import os
 import logging
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 from motor.motor_asyncio import AsyncIOMotorClient
 from bson import ObjectId
-from app.models.collection_model import Collection
-from app.config import settings
+from app.models.collection_model import Collection, CollectionResponse
+from app.config import get_settings
 import certifi
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Case-insensitive comparison, shared by the title index and title lookups
+_TITLE_COLLATION = {"locale": "en", "strength": 2}
+
+# Only the fields served to API clients are fetched for list reads
+_RESPONSE_PROJECTION = {name: 1 for name in CollectionResponse.model_fields if name != "id"}
+
 class CollectionRepository:
+    """MongoDB access for collections
+    
+    Documents are written from validated Collection models, so reads rebuild
+    them with model_construct() instead of validating them again.
+    """
+    
     def __init__(self):
         """Initialize MongoDB connection"""
+        settings = get_settings()
         try:
             # Create client with SSL certificate verification
             self.client = AsyncIOMotorClient(
@@ -34,12 +45,20 @@ class CollectionRepository:
             self.client.close()
             logger.info("Closed MongoDB connection")
 
+    @staticmethod
+    def _to_document(collection: Collection) -> Dict[str, Any]:
+        """Convert a collection to a MongoDB document"""
+        # Convert to dict and remove None values
+        data = collection.model_dump(exclude_none=True)
+        # Use a pre-assigned ID as the document key
+        if "id" in data:
+            data["_id"] = ObjectId(data.pop("id"))
+        return data
+
     async def insert(self, collection: Collection) -> str:
         """Insert a new collection"""
         try:
-            # Convert to dict and remove None values
-            data = collection.model_dump(exclude_none=True)
-            result = await self.collection.insert_one(data)
+            result = await self.collection.insert_one(self._to_document(collection))
             return str(result.inserted_id)
         except Exception as e:
             logger.error(f"Error inserting collection: {str(e)}")
@@ -53,19 +72,30 @@ class CollectionRepository:
             result = await self.collection.find_one({"_id": ObjectId(collection_id)})
             if result:
                 result["id"] = str(result.pop("_id"))
-                return Collection(**result)
+                return Collection.model_construct(**result)
             return None
         except Exception as e:
             logger.error(f"Error finding collection: {str(e)}")
             raise
 
+    async def ensure_indexes(self):
+        """Create the indexes used by repository queries"""
+        try:
+            await self.collection.create_index([("title", 1)], collation=_TITLE_COLLATION)
+        except Exception as e:
+            logger.error(f"Error creating indexes: {str(e)}")
+            raise
+
     async def find_by_title(self, title: str) -> Optional[Collection]:
-        """Find a collection by title"""
+        """Find a collection by title, ignoring case
+        
+        Uses the case-insensitive title index created by ensure_indexes().
+        """
         try:
-            result = await self.collection.find_one({"title": title})
+            result = await self.collection.find_one({"title": title}, collation=_TITLE_COLLATION)
             if result:
                 result["id"] = str(result.pop("_id"))
-                return Collection(**result)
+                return Collection.model_construct(**result)
             return None
         except Exception as e:
             logger.error(f"Error finding collection by title: {str(e)}")
@@ -78,12 +108,48 @@ class CollectionRepository:
             collections = []
             async for doc in cursor:
                 doc["id"] = str(doc.pop("_id"))
-                collections.append(Collection(**doc))
+                collections.append(Collection.model_construct(**doc))
             return collections
         except Exception as e:
             logger.error(f"Error finding all collections: {str(e)}")
             raise
 
+    @staticmethod
+    def _to_raw_response(doc: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape a projected document like CollectionResponse"""
+        doc["id"] = str(doc.pop("_id"))
+        # Fields dropped by exclude_none on insert
+        doc.setdefault("url", None)
+        doc.setdefault("scientific_topics", [])
+        doc.setdefault("metadata", {})
+        return doc
+
+    async def iter_all_raw(self, limit: int = 100) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all collections as plain dicts shaped like CollectionResponse
+        
+        Documents are yielded as the cursor receives them, so callers can
+        stream them without holding the whole result.
+        """
+        try:
+            cursor = self.collection.find({}, _RESPONSE_PROJECTION).limit(limit)
+            async for doc in cursor:
+                yield self._to_raw_response(doc)
+        except Exception as e:
+            logger.error(f"Error iterating collections: {str(e)}")
+            raise
+
+    async def update(self, collection: Collection) -> bool:
+        """Update an existing collection, keeping its creation time"""
+        try:
+            if not collection.id or not ObjectId.is_valid(collection.id):
+                return False
+            data = collection.model_dump(exclude_none=True, exclude={"id", "created_at"})
+            result = await self.collection.update_one({"_id": ObjectId(collection.id)}, {"$set": data})
+            return result.matched_count > 0
+        except Exception as e:
+            logger.error(f"Error updating collection: {str(e)}")
+            raise
+
     async def delete(self, collection_id: str) -> bool:
         """Delete a collection by ID"""
         try:
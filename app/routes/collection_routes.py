@@ -1,19 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Form, Query
-from fastapi.responses import JSONResponse
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel
-import aiofiles
-import os
-import tempfile
-import shutil
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, File, UploadFile, Form, Query, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import AsyncIterator, List, Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict
 import logging
+import orjson
 
-from app.models.collection_model import CollectionResponse, CollectionCreate
-from app.providers.collection_service import CollectionService
-from app.repositories.collection_repository import CollectionRepository
+from app.models.collection_model import Collection, CollectionResponse, CollectionCreate, CollectionListResponse
+from app.providers.collection_service import CollectionService, UploadTooLargeError
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Create router
@@ -21,7 +15,7 @@ router = APIRouter(tags=["collections"])
 
 class ScriptSubmission(BaseModel):
     """Schema for script submission"""
-    title: Optional[str] = "User Script"
+    title: str = "User Script"
     content: str
     script_type: Optional[str] = None
     target_audience: Optional[str] = None
@@ -30,8 +24,9 @@ class ScriptSubmission(BaseModel):
     language: Optional[str] = "en"
     visual_style: Optional[str] = None
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        extra='ignore',
+        json_schema_extra={
             "example": {
                 "title": "Quantum Computing Explained",
                 "content": "In this video, we'll explore the principles of quantum computing...",
@@ -43,31 +38,35 @@ class ScriptSubmission(BaseModel):
                 "visual_style": "Minimal"
             }
         }
+    )
 
 # Dependency
-async def get_collection_service():
-    repository = CollectionRepository()
-    service = CollectionService(repository=repository)
+def get_collection_service(request: Request) -> CollectionService:
+    """Get the application's shared collection service
+    
+    The service is created and connected once at startup; routes that use
+    the message broker still call ensure_connected() before publishing.
+    """
+    return request.app.state.collection_service
+
+async def _run_collection_job(job, *args):
+    """Run a queued collection job after the response has been sent
+    
+    The service logs its own failures; there is no client left to report
+    them to.
+    """
     try:
-        # Ensure message broker is connected
-        await service.connect()
-        logger.info("Message broker connected successfully")
-        yield service
-    except Exception as e:
-        logger.error(f"Error connecting to message broker: {str(e)}")
-        raise
-    finally:
-        # Only close the connection if it was successfully established
-        if service._connected:
-            await service.close()
-            logger.info("Message broker connection closed")
-
-@router.post("/api/collections/wikipedia", response_model=Dict[str, Any], status_code=201)
+        await job(*args)
+    except Exception:
+        logger.debug("Queued collection job failed", exc_info=True)
+
+@router.post("/api/collections/wikipedia", response_model=Dict[str, Any], status_code=202)
 async def collect_from_wikipedia(
     data: Dict[str, str],
+    background_tasks: BackgroundTasks,
     service: CollectionService = Depends(get_collection_service)
 ):
-    """Process a Wikipedia URL and create a collection"""
+    """Queue a Wikipedia URL for processing into a collection"""
     url = data.get('url')
     script_params ={
         "script_type": data.get('script_type'),
@@ -81,22 +80,24 @@ async def collect_from_wikipedia(
         raise HTTPException(status_code=400, detail="URL is required")
     
     try:
-        logger.info(f"Processing Wikipedia URL: {url}")
-        collection_id = await service.process_url(url, script_params)
-        logger.info(f"Successfully processed Wikipedia URL. Collection ID: {collection_id}")
-        return {
-            "message": "Wikipedia article processed successfully",
-            "collection_id": collection_id
-        }
+        service.validate_url(url)
     except ValueError as e:
-        logger.error(f"Invalid Wikipedia URL: {str(e)}")
+        logger.error("Invalid Wikipedia URL: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        logger.error(f"Error processing Wikipedia URL: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    
+    # Fetching, cleaning, storing and publishing happen after the response
+    collection_id = service.new_collection_id()
+    background_tasks.add_task(_run_collection_job, service.process_url, url, script_params, collection_id)
+    logger.info("Queued Wikipedia URL: %s. Collection ID: %s", url, collection_id)
+    return {
+        "message": "Wikipedia article queued for processing",
+        "collection_id": collection_id,
+        "status": "queued"
+    }
 
-@router.post("/api/collections/upload-file", response_model=Dict[str, Any], status_code=201)
+@router.post("/api/collections/upload-file", response_model=Dict[str, Any], status_code=202)
 async def upload_file(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     script_type: str = Form(...),
     target_audience: str = Form(...),
@@ -106,10 +107,13 @@ async def upload_file(
     voice: str = Form(...),
     service: CollectionService = Depends(get_collection_service)
 ):
-    """Upload and process a file"""
+    """Upload a file and queue it for processing"""
+    try:
+        service.validate_upload(file)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     try:
-
-        
         # Prepare configuration
         config = {
             "script_type": script_type,
@@ -120,56 +124,96 @@ async def upload_file(
             "voice": voice,
         }
 
-        # Process file
-        result = await service.process_file(file, config)
-        return result
-
-    except Exception as e:
-        logger.error(f"Error processing file: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@router.post("/api/collections/script", response_model=Dict[str, Any], status_code=201)
-async def submit_script(
-    submission: ScriptSubmission,
-    service: CollectionService = Depends(get_collection_service)
-):
-    """Submit a video script for processing"""
-    try:
-        # Create metadata from script parameters
-        metadata = {
-            "source": "user_input",
-            "script_type": submission.script_type,
-            "target_audience": submission.target_audience,
-            "duration": submission.duration,
-            "voice": submission.voice,
-            "language": submission.language,
-            "visual_style": submission.visual_style
-        }
-        
-        collection_id = await service.process_script(
-            content=submission.content, 
-            title=submission.title,
-            metadata=metadata
+        # The upload is read now, since it is closed once the response is
+        # sent; parsing, storing and publishing happen afterwards
+        content = await service.read_upload(file)
+        # Rejected here, since the queued job has no client to report to
+        if not content:
+            raise ValueError("File is empty")
+        collection_id = service.new_collection_id()
+        background_tasks.add_task(
+            _run_collection_job, service.process_file_content,
+            content, file.filename, file.content_type, config, collection_id
         )
-        
         return {
-            "message": "Video script processed successfully",
+            "status": "queued",
+            "message": "File queued for processing",
             "collection_id": collection_id
         }
+
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Error processing script: {str(e)}")
+        logger.error("Error processing file: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/api/collections", response_model=Dict[str, List[CollectionResponse]])
+@router.post("/api/collections/script", response_model=Dict[str, Any], status_code=202)
+async def submit_script(
+    submission: ScriptSubmission,
+    background_tasks: BackgroundTasks,
+    service: CollectionService = Depends(get_collection_service)
+):
+    """Submit a video script and queue it for processing"""
+    # Create metadata from script parameters
+    metadata = {
+        "source": "user_input",
+        "script_type": submission.script_type,
+        "target_audience": submission.target_audience,
+        "duration": submission.duration,
+        "voice": submission.voice,
+        "language": submission.language,
+        "visual_style": submission.visual_style
+    }
+    
+    # Storing and publishing happen after the response
+    collection_id = service.new_collection_id()
+    background_tasks.add_task(
+        _run_collection_job, service.process_script,
+        submission.content, submission.title, metadata, collection_id
+    )
+    
+    return {
+        "message": "Video script queued for processing",
+        "collection_id": collection_id,
+        "status": "queued"
+    }
+
+async def _stream_collections(first: Optional[Dict[str, Any]],
+                              rest: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Encode collections as a {"collections": [...]} JSON document, piece by piece"""
+    yield b'{"collections":['
+    if first is not None:
+        yield orjson.dumps(first)
+        async for collection in rest:
+            yield b',' + orjson.dumps(collection)
+    yield b']}'
+
+@router.get(
+    "/api/collections",
+    response_class=StreamingResponse,
+    responses={200: {"model": CollectionListResponse, "content": {"application/json": {}}}}
+)
 async def get_all_collections(
     limit: int = Query(100, description="Maximum number of collections to return"),
     service: CollectionService = Depends(get_collection_service)
 ):
     """Get all collections"""
-    collections = await service.get_all_collections(limit)
-    return {"collections": [c.to_response() for c in collections]}
+    # Raw documents are serialized directly with orjson, without building
+    # and validating a model per collection, and streamed as the cursor
+    # returns them. The first batch is read before the response starts, so
+    # a failing query still gets an error status.
+    collections = service.iter_all_collections_raw(limit)
+    try:
+        first = await collections.__anext__()
+    except StopAsyncIteration:
+        first = None
+    except Exception as e:
+        logger.error("Error listing collections: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return StreamingResponse(_stream_collections(first, collections), media_type="application/json")
 
 @router.get("/api/collections/{collection_id}", response_model=CollectionResponse)
 async def get_collection(
@@ -181,7 +225,7 @@ async def get_collection(
     if not collection:
         raise HTTPException(status_code=404, detail=f"Collection not found: {collection_id}")
     
-    return collection.to_response()
+    return ORJSONResponse(collection.to_response().model_dump())
 
 @router.delete("/api/collections/{collection_id}", response_model=Dict[str, str])
 async def delete_collection(
@@ -201,11 +245,11 @@ async def get_related_articles(
     service: CollectionService = Depends(get_collection_service)
 ):
     """Get related articles for a collection"""
-    collection = await service.get_collection(collection_id)
-    if not collection:
+    # The service looks the collection up itself, so it is read only once
+    related = await service.get_related_articles(collection_id)
+    if related is None:
         raise HTTPException(status_code=404, detail=f"Collection not found: {collection_id}")
     
-    related = await service.get_related_articles(collection_id)
     return {"related_articles": related}
 
 @router.put("/api/collections/{collection_id}", response_model=Dict[str, Any])
@@ -244,5 +288,5 @@ async def update_collection(
             "collection_id": collection_id
         }
     except Exception as e:
-        logger.error(f"Error updating collection: {str(e)}")
+        logger.error("Error updating collection: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -1,37 +1,47 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from typing import Dict, Any
-from datetime import datetime
+import time
 
-from app.repositories.collection_repository import CollectionRepository
+from app.utils.helpers import utc_timestamp
 
 # Create router
 router = APIRouter(tags=["Health"])
 
+# Seconds a successful MongoDB probe is reused for, so frequent liveness and
+# readiness probes do not each hit the database
+HEALTH_CHECK_TTL = 3.0
+
+# Monotonic time of the last successful MongoDB probe
+_last_healthy_check: float = float("-inf")
+
 @router.get("/health")
-def health_check() -> Dict[str, Any]:
+async def health_check(request: Request) -> Dict[str, Any]:
         """Check the health status of the service and its dependencies
         
         Returns:
             Dictionary containing health information
         """
+        global _last_healthy_check
+        
         # Check MongoDB connection
         mongo_status = "healthy"
         mongo_error = None
         
-        try:
-            # Create a temporary repository to check connection
-            repo = CollectionRepository()
-            # Try a simple MongoDB operation
-            repo.collections.find_one({}, {"_id": 1})
-            repo.close()
-        except Exception as e:
-            mongo_status = "unhealthy"
-            mongo_error = str(e)
+        now = time.monotonic()
+        if now - _last_healthy_check >= HEALTH_CHECK_TTL:
+            try:
+                # Try a simple MongoDB operation on the shared repository
+                repo = request.app.state.repository
+                await repo.collection.find_one({}, {"_id": 1})
+                _last_healthy_check = now
+            except Exception as e:
+                mongo_status = "unhealthy"
+                mongo_error = str(e)
         
         # Generate response
         return {
             "status": "healthy" if mongo_status == "healthy" else "degraded",
-            "timestamp": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
+            "timestamp": utc_timestamp(),
             "version": "1.0.0",  # This could be fetched from a config
             "dependencies": {
                 "mongodb": {
@@ -39,4 +49,4 @@ def health_check() -> Dict[str, Any]:
                     "error": mongo_error
                 }
             }
-        }
\ No newline at end of file
+        }
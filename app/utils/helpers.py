@@ -1,11 +1,71 @@
+import hashlib
 import re
-from typing import List, Optional
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
 import os
 
+# Aho-Corasick scanner for topic keywords, when pyahocorasick is installed
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_WIKIPEDIA_URL = re.compile(r'^https?://(www\.)?([a-z]{2}\.)?wikipedia\.org/wiki/.+')
+
+# Scientific topics and their related keywords
+TOPIC_KEYWORDS = {
+    "dna": ["dna", "genome", "genetic", "chromosome", "nucleotide", "gene"],
+    "rna": ["rna", "mrna", "trna", "ribonucleic", "transcription"],
+    "protein": ["protein", "amino acid", "peptide", "enzyme", "antibody"],
+    "cell": ["cell", "cellular", "mitochondria", "nucleus", "organelle"],
+    "biology": ["biology", "biological", "organism", "species", "taxonomy"],
+    "physics": ["physics", "quantum", "relativity", "particle", "atomic"],
+    "chemistry": ["chemistry", "chemical", "molecule", "compound", "reaction"],
+    "math": ["math", "mathematics", "algorithm", "calculus", "equation"],
+    "neuroscience": ["neuron", "brain", "neural", "synaptic", "cognitive"],
+    "climate": ["climate", "atmospheric", "temperature", "greenhouse", "carbon"]
+}
+
+def _build_topic_automaton():
+    """Build an automaton reporting the topic of every keyword occurrence"""
+    automaton = ahocorasick.Automaton()
+    for topic, keywords in TOPIC_KEYWORDS.items():
+        for keyword in keywords:
+            automaton.add_word(keyword, topic)
+    automaton.make_automaton()
+    return automaton
+
+_TOPIC_AUTOMATON = _build_topic_automaton() if ahocorasick else None
+
+# Number of documents whose topics extract_topics_cached remembers
+TOPICS_CACHE_SIZE = 1024
+
+_topics_cache: "OrderedDict[bytes, Tuple[str, ...]]" = OrderedDict()
+_topics_cache_lock = threading.Lock()
+
+# (epoch second, formatted timestamp) of the last utc_timestamp() call
+_last_timestamp: Tuple[int, str] = (0, "")
+
 def is_wikipedia_url(url: str) -> bool:
     """Check if a URL is a valid Wikipedia article URL"""
-    pattern = r'^https?://(www\.)?([a-z]{2}\.)?wikipedia\.org/wiki/.+'
-    return bool(re.match(pattern, url))
+    return bool(_WIKIPEDIA_URL.match(url))
+
+def utc_timestamp() -> str:
+    """Get the current UTC time formatted with TIMESTAMP_FORMAT
+    
+    The formatted string only changes once per second, so it is cached and
+    strftime runs at most once per second.
+    """
+    global _last_timestamp
+    now = int(time.time())
+    if now != _last_timestamp[0]:
+        _last_timestamp = (now, datetime.fromtimestamp(now, timezone.utc).strftime(TIMESTAMP_FORMAT))
+    return _last_timestamp[1]
 
 def get_file_extension(filename: str) -> str:
     """Get the file extension from a filename"""
@@ -14,8 +74,8 @@ def get_file_extension(filename: str) -> str:
 def is_supported_file_type(filename: str, supported_types: Optional[List[str]] = None) -> bool:
     """Check if a file type is supported"""
     if not supported_types:
-        from app.config import SUPPORTED_FILE_TYPES
-        supported_types = SUPPORTED_FILE_TYPES
+        from app.config import get_settings
+        supported_types = get_settings().SUPPORTED_FILE_TYPES
     
     ext = get_file_extension(filename)
     return ext in supported_types
@@ -26,27 +86,38 @@ def extract_topics(text: str) -> List[str]:
     This is a simple implementation that checks for keywords.
     In a production environment, consider using NLP techniques.
     """
-    # Define scientific topics and their related keywords
-    topics_dict = {
-        "dna": ["dna", "genome", "genetic", "chromosome", "nucleotide", "gene"],
-        "rna": ["rna", "mrna", "trna", "ribonucleic", "transcription"],
-        "protein": ["protein", "amino acid", "peptide", "enzyme", "antibody"],
-        "cell": ["cell", "cellular", "mitochondria", "nucleus", "organelle"],
-        "biology": ["biology", "biological", "organism", "species", "taxonomy"],
-        "physics": ["physics", "quantum", "relativity", "particle", "atomic"],
-        "chemistry": ["chemistry", "chemical", "molecule", "compound", "reaction"],
-        "math": ["math", "mathematics", "algorithm", "calculus", "equation"],
-        "neuroscience": ["neuron", "brain", "neural", "synaptic", "cognitive"],
-        "climate": ["climate", "atmospheric", "temperature", "greenhouse", "carbon"]
-    }
-    
-    found_topics = set()
     text_lower = text.lower()
     
-    for topic, keywords in topics_dict.items():
+    # One pass over the text in C finds every keyword, like the substring
+    # checks below
+    if _TOPIC_AUTOMATON is not None:
+        return list({topic for _, topic in _TOPIC_AUTOMATON.iter(text_lower)})
+    
+    found_topics = set()
+    for topic, keywords in TOPIC_KEYWORDS.items():
         for keyword in keywords:
             if keyword in text_lower:
                 found_topics.add(topic)
                 break
     
-    return list(found_topics)
\ No newline at end of file
+    return list(found_topics)
+
+def extract_topics_cached(text: str) -> List[str]:
+    """Extract scientific topics from text, memoized on a content digest
+    
+    Re-ingested documents skip the keyword scan. The cache is keyed by a
+    16-byte BLAKE2b digest so it never holds on to full document texts.
+    """
+    digest = hashlib.blake2b(text.encode(), digest_size=16).digest()
+    with _topics_cache_lock:
+        topics = _topics_cache.get(digest)
+        if topics is not None:
+            _topics_cache.move_to_end(digest)
+            return list(topics)
+    
+    topics = tuple(extract_topics(text))
+    with _topics_cache_lock:
+        _topics_cache[digest] = topics
+        if len(_topics_cache) > TOPICS_CACHE_SIZE:
+            _topics_cache.popitem(last=False)
+    return list(topics)
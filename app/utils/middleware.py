@@ -0,0 +1,30 @@
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class LimitUploadSizeMiddleware:
+    """Reject requests whose declared body is larger than max_size with 413
+
+    A Content-Length that is not a number is rejected with 400. This is a
+    plain ASGI middleware, so the check runs before anything reads the
+    body. Requests without a Content-Length (chunked uploads) are let
+    through; CollectionService.read_upload caps those as it reads them.
+    """
+
+    def __init__(self, app: ASGIApp, max_size: int):
+        self.app = app
+        self.max_size = max_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            for name, value in scope["headers"]:
+                if name == b"content-length":
+                    if not value.isdigit():
+                        response = PlainTextResponse("Invalid Content-Length", status_code=400)
+                    elif int(value) > self.max_size:
+                        response = PlainTextResponse("Request body too large", status_code=413)
+                    else:
+                        break
+                    await response(scope, receive, send)
+                    return
+        await self.app(scope, receive, send)
@@ -1,23 +1,42 @@
-import requests
+import httpx
 from typing import Dict, Any, Optional
 
 
 class ServiceClient:
-    """Simple HTTP client for communicating with other services"""
+    """Simple HTTP client for communicating with other services
     
-    def __init__(self, base_url: str):
+    Requests share one pooled HTTP/2 connection to the service; call
+    aclose() (or use ``async with``) when the client is no longer needed.
+    """
+    
+    def __init__(self, base_url: str, client: Optional[httpx.AsyncClient] = None):
         self.base_url = base_url.rstrip('/')
+        self._client = client or httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=100)
+        )
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
     
-    def get(self, endpoint: str, params: Dict = None) -> Dict[str, Any]:
+    async def aclose(self) -> None:
+        """Close the underlying connection pool"""
+        await self._client.aclose()
+    
+    async def get(self, endpoint: str, params: Dict = None) -> Dict[str, Any]:
         """Make a GET request to another service"""
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        response = requests.get(url, params=params)
+        response = await self._client.get(url, params=params)
         response.raise_for_status()
         return response.json()
     
-    def post(self, endpoint: str, data: Dict) -> Dict[str, Any]:
+    async def post(self, endpoint: str, data: Dict) -> Dict[str, Any]:
         """Make a POST request to another service"""
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        response = requests.post(url, json=data)
+        response = await self._client.post(url, json=data)
         response.raise_for_status()
-        return response.json()
\ No newline at end of file
+        return response.json()
@@ -2,6 +2,7 @@ import uvicorn
 import os
 
 from app import create_app
+from app.config import get_settings
 
 app = create_app()
 
@@ -9,5 +10,17 @@ if __name__ == "__main__":
     # Get port from environment or use default
     port = int(os.environ.get("PORT", 5000))
     
-    # Run the application
-    uvicorn.run("main:app", host="127.0.0.1", port=port, reload=True)
\ No newline at end of file
+    # Run the application: a single autoreloading process in development,
+    # one worker per core otherwise. loop="auto" picks uvloop where it is
+    # installed (it is not available on Windows).
+    if get_settings().ENV == "development":
+        uvicorn.run("main:app", host="127.0.0.1", port=port, reload=True)
+    else:
+        uvicorn.run(
+            "main:app",
+            host="127.0.0.1",
+            port=port,
+            workers=int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1)),
+            loop="auto",
+            http="httptools",
+        )
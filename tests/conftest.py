@@ -1,5 +1,13 @@
 import pytest
+from starlette.formparsers import MultiPartParser
 
 @pytest.fixture
 def sample_fixture():
-    return "sample data"
\ No newline at end of file
+    return "sample data"
+
+@pytest.fixture(autouse=True)
+def restore_spool_size():
+    """Undo the process-wide spool size create_app() sets"""
+    spool_size = MultiPartParser.max_file_size
+    yield
+    MultiPartParser.max_file_size = spool_size
@@ -1,4 +1,136 @@
+import io
 import pytest
+from starlette.datastructures import UploadFile
 
-def test_collection_service():
-    assert True  # Replace with actual test logic
\ No newline at end of file
+from app.config import get_settings
+from app.models.collection_model import Collection
+from app.providers.collection_service import CollectionService, UploadTooLargeError
+
+class FakeRepository:
+    """In-memory stand-in for CollectionRepository"""
+
+    def __init__(self):
+        self.collections = {}
+        self.reads = 0
+        self.deleted = []
+
+    async def find_by_id(self, collection_id):
+        self.reads += 1
+        return self.collections.get(collection_id)
+
+    async def insert(self, collection):
+        self.collections[collection.id] = collection
+        return collection.id
+
+    async def update(self, collection):
+        self.collections[collection.id] = collection
+        return True
+
+    async def delete(self, collection_id):
+        self.deleted.append(collection_id)
+        return self.collections.pop(collection_id, None) is not None
+
+@pytest.fixture
+def repository():
+    return FakeRepository()
+
+@pytest.fixture
+def service(repository):
+    return CollectionService(repository=repository)
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://en.wikipedia.org/wiki/Quantum_computing", "wikipedia"),
+    ("https://de.wikipedia.org/wiki/Quantencomputer", "wikipedia"),
+    ("http://www.wikipedia.org/wiki/Physics", "wikipedia"),
+    ("https://pubmed.ncbi.nlm.nih.gov/12345678/", "pubmed"),
+    ("https://www.pubmed.ncbi.nlm.nih.gov/12345678/", "pubmed"),
+])
+def test_get_url_processor_routes_by_url(service, url, expected):
+    service.url_processors = {"wikipedia": "wikipedia", "pubmed": "pubmed"}
+
+    assert service._get_url_processor(url) == expected
+
+@pytest.mark.parametrize("url", [
+    "https://example.com/wiki/Physics",
+    "ftp://en.wikipedia.org/wiki/Physics",
+])
+def test_get_url_processor_rejects_unsupported_url(service, url):
+    service.url_processors = {"wikipedia": "wikipedia", "pubmed": "pubmed"}
+
+    with pytest.raises(ValueError):
+        service._get_url_processor(url)
+
+@pytest.mark.asyncio
+async def test_read_upload_accepts_file_at_limit(service, monkeypatch):
+    monkeypatch.setattr(get_settings(), "MAX_FILE_SIZE", 10)
+    upload = UploadFile(file=io.BytesIO(b"x" * 10), filename="script.txt")
+
+    assert await service.read_upload(upload) == b"x" * 10
+
+@pytest.mark.asyncio
+async def test_read_upload_rejects_file_over_limit(service, monkeypatch):
+    monkeypatch.setattr(get_settings(), "MAX_FILE_SIZE", 10)
+    upload = UploadFile(file=io.BytesIO(b"x" * 11), filename="script.txt")
+
+    with pytest.raises(UploadTooLargeError):
+        await service.read_upload(upload)
+
+def _collection(collection_id, content="original"):
+    return Collection(id=collection_id, title="Title", content=content)
+
+@pytest.mark.asyncio
+async def test_get_collection_is_served_from_cache(service, repository):
+    collection_id = service.new_collection_id()
+    repository.collections[collection_id] = _collection(collection_id)
+
+    first = await service.get_collection(collection_id)
+    second = await service.get_collection(collection_id)
+
+    assert repository.reads == 1
+    assert first == second
+    # Callers get their own copies
+    first.content = "changed"
+    assert (await service.get_collection(collection_id)).content == "original"
+
+@pytest.mark.asyncio
+async def test_update_collection_invalidates_cache(service, repository):
+    collection_id = service.new_collection_id()
+    repository.collections[collection_id] = _collection(collection_id)
+    await service.get_collection(collection_id)
+
+    await service.update_collection(_collection(collection_id, content="updated"))
+
+    assert (await service.get_collection(collection_id)).content == "updated"
+    assert repository.reads == 2
+
+@pytest.mark.asyncio
+async def test_delete_collection_invalidates_cache(service, repository):
+    collection_id = service.new_collection_id()
+    repository.collections[collection_id] = _collection(collection_id)
+    await service.get_collection(collection_id)
+
+    assert await service.delete_collection(collection_id)
+
+    assert await service.get_collection(collection_id) is None
+
+@pytest.mark.asyncio
+async def test_missing_collection_is_not_cached(service, repository):
+    collection_id = service.new_collection_id()
+    assert await service.get_collection(collection_id) is None
+
+    repository.collections[collection_id] = _collection(collection_id)
+
+    assert await service.get_collection(collection_id) is not None
+
+@pytest.mark.asyncio
+async def test_store_and_publish_removes_collection_when_publish_fails(service, repository, monkeypatch):
+    async def failing_publish(data):
+        raise RuntimeError("broker down")
+    monkeypatch.setattr(service.message_broker, "publish_data_collected", failing_publish)
+    collection_id = service.new_collection_id()
+
+    with pytest.raises(RuntimeError):
+        await service._store_and_publish(_collection(None), {}, collection_id)
+
+    assert repository.deleted == [collection_id]
+    assert collection_id not in repository.collections
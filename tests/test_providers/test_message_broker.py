@@ -0,0 +1,117 @@
+import asyncio
+import contextlib
+import pytest
+
+from app.providers import message_broker
+from app.providers.message_broker import DataCollectorMessageBroker
+
+class FakeExchange:
+    """Exchange whose publishes wait until released, or fail"""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.published = []
+        self.active = 0
+        self.peak = 0
+        self.release = asyncio.Event()
+
+    async def publish(self, message, routing_key):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await self.release.wait()
+            if self.error:
+                raise self.error
+            self.published.append(message.body)
+        finally:
+            self.active -= 1
+
+class FakeChannel:
+    def __init__(self, exchange):
+        self.exchange = exchange
+
+    async def get_exchange(self, name, ensure=True):
+        return self.exchange
+
+class FakePool:
+    """Channel pool that hands out any number of channels at once"""
+
+    def __init__(self, exchange):
+        self.channel = FakeChannel(exchange)
+        self.closed = False
+
+    @contextlib.asynccontextmanager
+    async def acquire(self):
+        yield self.channel
+
+    async def close(self):
+        self.closed = True
+
+def _connected_broker(exchange):
+    broker = DataCollectorMessageBroker()
+    broker.channel = object()
+    broker.exchange = exchange
+    broker.channel_pool = FakePool(exchange)
+    return broker
+
+@pytest.mark.asyncio
+async def test_publish_requires_connection():
+    broker = DataCollectorMessageBroker()
+
+    with pytest.raises(RuntimeError):
+        await broker.publish_data_collected({"collection_id": "1"})
+
+@pytest.mark.asyncio
+async def test_in_flight_publishes_are_bounded():
+    exchange = FakeExchange()
+    broker = _connected_broker(exchange)
+    broker._inflight = asyncio.Semaphore(2)
+
+    publishes = [asyncio.create_task(broker.publish_data_collected({"n": n})) for n in range(5)]
+    await asyncio.sleep(0)
+    assert exchange.active == 2
+
+    exchange.release.set()
+    await asyncio.gather(*publishes)
+    assert exchange.peak == 2
+    assert len(exchange.published) == 5
+
+@pytest.mark.asyncio
+async def test_publish_failure_is_raised():
+    exchange = FakeExchange(error=ConnectionError("channel closed"))
+    exchange.release.set()
+    broker = _connected_broker(exchange)
+
+    with pytest.raises(ConnectionError):
+        await broker.publish_data_collected({"collection_id": "1"})
+    assert broker._idle.is_set()
+
+@pytest.mark.asyncio
+async def test_close_waits_for_in_flight_publishes():
+    exchange = FakeExchange()
+    broker = _connected_broker(exchange)
+    publish = asyncio.create_task(broker.publish_data_collected({"collection_id": "1"}))
+    await asyncio.sleep(0)
+
+    close = asyncio.create_task(broker.close())
+    await asyncio.sleep(0)
+    assert not close.done()
+    assert not broker.channel_pool.closed
+
+    exchange.release.set()
+    await asyncio.gather(publish, close)
+    assert exchange.published == [b'{"collection_id":"1"}']
+    assert broker.channel_pool.closed
+
+@pytest.mark.asyncio
+async def test_close_gives_up_on_publishes_after_timeout(monkeypatch):
+    monkeypatch.setattr(message_broker, "CLOSE_DRAIN_TIMEOUT", 0.01)
+    exchange = FakeExchange()
+    broker = _connected_broker(exchange)
+    publish = asyncio.create_task(broker.publish_data_collected({"collection_id": "1"}))
+    await asyncio.sleep(0)
+
+    await broker.close()
+
+    assert broker.channel_pool.closed
+    publish.cancel()
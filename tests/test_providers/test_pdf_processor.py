@@ -0,0 +1,32 @@
+import fitz
+import pytest
+
+from app.providers.file.pdf_processor import PDFProcessor
+
+def _pdf(pages):
+    doc = fitz.open()
+    for text in pages:
+        page = doc.new_page()
+        if text:
+            page.insert_text((72, 72), text)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+def test_pages_are_extracted_in_order():
+    pages = [f"Page {n}" for n in range(12)]
+
+    result = PDFProcessor().process_bytes(_pdf(pages), "paper.pdf")
+
+    assert [line for line in result["content"].splitlines() if line] == pages
+    assert result["metadata"]["page_count"] == 12
+    assert result["metadata"]["filename"] == "paper.pdf"
+
+def test_pages_without_text_are_empty():
+    result = PDFProcessor().process_bytes(_pdf(["First", "", "Third"]), "paper.pdf")
+
+    assert result["content"] == "First\n\n\nThird\n\n"
+
+def test_invalid_pdf_raises_value_error():
+    with pytest.raises(ValueError):
+        PDFProcessor().process_bytes(b"not a pdf", "paper.pdf")
@@ -0,0 +1,54 @@
+import asyncio
+import pytest
+
+from app.providers.url.wikipedia_processor import WikipediaProcessor
+
+class SearchCounter:
+    """Stand-in for _search_related_articles that counts searches"""
+
+    def __init__(self, result):
+        self.result = result
+        self.calls = 0
+
+    async def __call__(self, title):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return self.result
+
+def _related(title):
+    return [{"title": title, "url": f"https://en.wikipedia.org/wiki/{title}", "snippet": ""}]
+
+@pytest.mark.asyncio
+async def test_related_articles_are_cached_per_title(monkeypatch):
+    processor = WikipediaProcessor()
+    search = SearchCounter(_related("Qubit"))
+    monkeypatch.setattr(processor, "_search_related_articles", search)
+
+    first = await processor.get_related_articles("Quantum computing")
+    first[0]["title"] = "changed"
+    second = await processor.get_related_articles("Quantum computing")
+
+    assert search.calls == 1
+    assert second == _related("Qubit")
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_search(monkeypatch):
+    processor = WikipediaProcessor()
+    search = SearchCounter(_related("Qubit"))
+    monkeypatch.setattr(processor, "_search_related_articles", search)
+
+    results = await asyncio.gather(*(processor.get_related_articles("Quantum computing") for _ in range(5)))
+
+    assert search.calls == 1
+    assert all(result == _related("Qubit") for result in results)
+    assert not processor._related_loads
+
+@pytest.mark.asyncio
+async def test_failed_search_is_not_cached(monkeypatch):
+    processor = WikipediaProcessor()
+    search = SearchCounter(None)
+    monkeypatch.setattr(processor, "_search_related_articles", search)
+
+    assert await processor.get_related_articles("Quantum computing") == []
+    assert await processor.get_related_articles("Quantum computing") == []
+    assert search.calls == 2
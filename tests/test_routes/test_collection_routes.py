@@ -0,0 +1,77 @@
+import pytest
+from fastapi.testclient import TestClient
+from starlette.formparsers import MultiPartParser
+
+from app import create_app
+from app.config import get_settings
+from app.routes.collection_routes import get_collection_service
+
+@pytest.fixture
+def client():
+    # Startup is not run, so no broker or database connection is made
+    return TestClient(create_app())
+
+def test_script_with_null_title_is_rejected(client):
+    response = client.post("/api/collections/script", json={"title": None, "content": "A script"})
+
+    assert response.status_code == 422
+
+def test_empty_upload_is_rejected_before_queueing(client):
+    response = client.post(
+        "/api/collections/upload-file",
+        files={"file": ("empty.txt", b"", "text/plain")},
+        data={
+            "script_type": "Explainer",
+            "target_audience": "Students",
+            "duration": "Short",
+            "visual_style": "Minimal",
+            "voice": "Male Voice 1",
+        },
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "File is empty"
+
+class FakeListService:
+    """Collection service whose list read yields documents or fails"""
+
+    def __init__(self, docs=(), error=None):
+        self.docs = docs
+        self.error = error
+
+    async def iter_all_collections_raw(self, limit):
+        if self.error:
+            raise self.error
+        for doc in self.docs[:limit]:
+            yield doc
+
+def _with_service(service):
+    app = create_app()
+    app.dependency_overrides[get_collection_service] = lambda: service
+    return TestClient(app)
+
+def test_collections_are_streamed_as_one_document():
+    docs = [{"id": str(n), "title": f"Title {n}"} for n in range(3)]
+    client = _with_service(FakeListService(docs))
+
+    response = client.get("/api/collections", params={"limit": 2})
+
+    assert response.status_code == 200
+    assert response.json() == {"collections": docs[:2]}
+
+def test_empty_collection_list():
+    client = _with_service(FakeListService())
+
+    assert client.get("/api/collections").json() == {"collections": []}
+
+def test_failing_list_query_is_an_error_response():
+    client = _with_service(FakeListService(error=RuntimeError("cursor killed")))
+
+    response = client.get("/api/collections")
+
+    assert response.status_code == 500
+
+def test_create_app_sets_upload_spool_size():
+    create_app()
+
+    assert MultiPartParser.max_file_size == get_settings().UPLOAD_SPOOL_SIZE
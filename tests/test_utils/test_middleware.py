@@ -0,0 +1,46 @@
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app import create_app
+from app.utils.middleware import LimitUploadSizeMiddleware
+
+@pytest.fixture
+def client():
+    inner = FastAPI()
+
+    @inner.post("/upload")
+    async def upload(request: Request):
+        return {"size": len(await request.body())}
+
+    inner.add_middleware(LimitUploadSizeMiddleware, max_size=10)
+    return TestClient(inner)
+
+def test_body_within_limit_passes(client):
+    response = client.post("/upload", content=b"x" * 10)
+
+    assert response.status_code == 200
+    assert response.json() == {"size": 10}
+
+def test_body_over_limit_is_rejected(client):
+    response = client.post("/upload", content=b"x" * 11)
+
+    assert response.status_code == 413
+
+def test_non_numeric_content_length_is_rejected(client):
+    response = client.post("/upload", content=b"x", headers={"Content-Length": "ten"})
+
+    assert response.status_code == 400
+
+def test_upload_413_carries_cors_headers():
+    # Startup is not run, so no broker or database connection is made
+    client = TestClient(create_app())
+
+    response = client.post(
+        "/api/collections/upload-file",
+        headers={"Origin": "https://example.com", "Content-Length": str(10 ** 9)},
+        content=b"",
+    )
+
+    assert response.status_code == 413
+    assert "access-control-allow-origin" in response.headers